@@ -0,0 +1,80 @@
+"""
+Microbenchmark for Event loading and saving.
+Reports the time to build, load (from_dict) and save (to_dict) events, and the memory they hold.
+
+Usage: python benchmarks/bench_event.py [count]   (default 100000)
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+from event import Event, get_zone
+
+COUNT = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+
+
+def sample_dicts(count):
+    """Event dicts in the events.json layout, spread over a year of 30-minute slots."""
+    tz = get_zone('America/Toronto')
+    base = datetime(2025, 1, 6, 8, 0, tzinfo=tz)
+    dicts = []
+    for i in range(count):
+        start = base + timedelta(minutes=30 * i)
+        end = start + timedelta(minutes=45)
+        dicts.append({
+            'id': f"event{i}",
+            'summary': f"Event {i}",
+            'date': start.date().isoformat(),
+            'start': start.isoformat(),
+            'end': end.isoformat(),
+            'duration': 45,
+            'location': '',
+            'description': '',
+            'calendarName': 'primary',
+            'eventType': 'timed'
+        })
+    return dicts
+
+
+def timed(label, fn):
+    """Run fn once and print its wall time per COUNT events."""
+    began = time.perf_counter()
+    result = fn()
+    print(f"{label:<28} {(time.perf_counter() - began) * 1000:9.1f} ms")
+    return result
+
+
+def held_memory(fn):
+    """Memory still allocated by fn's result once everything else it built is freed."""
+    tracemalloc.start()
+    result = fn()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, held
+
+
+def main():
+    text = json.dumps(sample_dicts(COUNT))
+    dicts = json.loads(text)
+    tz = get_zone('America/Toronto')
+    print(f"{COUNT} events")
+    timed("Event(...)", lambda: [
+        Event(d['summary'], start=d['start'], end=d['end'], duration=45, id=d['id'], timezone=tz)
+        for d in dicts])
+    events = timed("Event.from_dict", lambda: [Event.from_dict(d, timezone=tz) for d in dicts])
+    timed("to_dict (unchanged)", lambda: [e.to_dict() for e in events])
+    for e in events:
+        e.start = e.start + timedelta(minutes=5)
+    timed("to_dict (moved)", lambda: [e.to_dict() for e in events])
+
+    # Load from freshly parsed JSON and drop the dicts, as the event store does
+    events, held = held_memory(lambda: [Event.from_dict(d, timezone=tz) for d in json.loads(text)])
+    print(f"{'memory (from_dict)':<28} {held / 1024 / 1024:9.1f} MiB  ({held / COUNT:.0f} bytes/event)")
+
+
+if __name__ == '__main__':
+    main()
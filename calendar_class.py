@@ -1,34 +1,243 @@
 from datetime import datetime, date, time, timedelta
-from zoneinfo import ZoneInfo
-from event import Event
+from event import Event, get_zone
+from event_store import EventStore, SQLiteEventStore, IntervalIndex, aware
+from freebusy import FreeBusyMap, BusyBlock, is_all_day
+from event_batch import EventBatch
 import interpreter
 import os
 import json
 from googleapiclient.errors import HttpError
-from pathlib import Path
 import copy
+import threading
+import time as time_module
+from concurrent.futures import ThreadPoolExecutor
+
+EVENTS_FILE = "events.json"
+# Chores and todos are placed between these times
+WORK_DAY_START = time(8, 0)
+WORK_DAY_END = time(20, 0)
+# How many days ahead todos may be placed, and which pending events are placed first
+SCHEDULE_HORIZON_DAYS = 7
+SCHEDULE_ORDER = 'longest'
+# Only request the fields the Event constructor uses
+EVENT_LIST_FIELDS = "nextPageToken,items(id,summary,description,location,start,end)"
+EVENTS_PAGE_SIZE = 2500
+# Google Calendar accepts up to 50 calls per batch request
+BATCH_SIZE = 50
+# Error recorded for operations skipped because commit_events was cancelled
+COMMIT_CANCELLED = "Cancelled before it was sent"
+# Upper bound on concurrent calendar requests
+MAX_WORKERS = 8
+# Incremental sync keeps a local mirror of every calendar plus its nextSyncToken
+SYNC_FILE = "calendar_sync.json"
+SYNC_LIST_FIELDS = "nextPageToken,nextSyncToken,items(id,status,summary,description,location,start,end)"
+# How far back and ahead the initial full sync reaches; bounding the end keeps recurring
+# events without an end date from expanding forever
+SYNC_LOOKBACK_DAYS = 365
+SYNC_LOOKAHEAD_DAYS = 365
+# Calendar names, IDs and the primary timezone are cached so startup needs no requests
+METADATA_FILE = "calendar_metadata.json"
+METADATA_TTL = 24 * 60 * 60
+# freebusy().query accepts at most 50 calendars per request
+FREEBUSY_MAX_CALENDARS = 50
+
+class ScheduleDelta:
+    """
+    The result of one incremental scheduling pass.
+
+    Attributes:
+        added (list[Event]): New events that were placed.
+        moved (list[tuple[Event, Event]]): (original, moved copy) for each existing chore given
+            a new time. The original is left untouched, so whoever shows it can swap in the copy.
+        unplaceable (list[Event]): New events that could not be placed.
+        notes (list[str]): Conflicts worth telling the user about, including displaced chores
+            that could not be moved and so keep their old time.
+    """
+    def __init__(self):
+        self.added = []
+        self.moved = []
+        self.unplaceable = []
+        self.notes = []
+
 
 class Calendar:
-    def __init__(self, service):
+    def __init__(self, service, service_factory=None, max_workers=MAX_WORKERS, incremental_sync=False,
+                 storage='json', remote_busy=False):
         """Initialize a Calendar instance with a Google Calendar service.
            Builds name-to-ID and ID-to-name mappings for calendars.
-           Sets the primary timezone for the calendar."""
+           Sets the primary timezone for the calendar.
+
+           If service_factory is given, per-calendar requests run concurrently on a
+           bounded worker pool. Each worker builds its own service (and so its own
+           HTTP connection, reused across requests) because the shared service's
+           httplib2 transport is not thread-safe. Every other request then also uses
+           a service of the calling thread's own, as callers may run on several threads.
+
+           If incremental_sync is set, event fetches are answered from a local mirror
+           kept in SYNC_FILE, which is refreshed with Google sync tokens so only
+           changed or deleted events are downloaded.
+
+           Calendar mappings and the timezone come from METADATA_FILE when it exists.
+           Once older than METADATA_TTL they are refreshed in the background (in the
+           foreground if there is no service_factory to give the refresh its own service).
+
+           storage selects the event store backend: 'json' (events.json, EventStore) or
+           'sqlite' (events.db, SQLiteEventStore, migrating an existing events.json once).
+
+           If remote_busy is set, scheduling also avoids the busy blocks reported by the
+           freebusy API for every calendar, queried once over the scheduling horizon and
+           kept for the session (see query_busy)."""
         self.service = service
-        self.name_to_id, self.id_to_name = self._build_maps()
-        self.timezone = self._get_primary_timezone()
+        self.service_factory = service_factory
+        self.max_workers = max_workers
+        self.incremental_sync = incremental_sync
+        self.storage = storage
+        self.remote_busy = remote_busy
+        self.working_hours = (WORK_DAY_START, WORK_DAY_END)
+        self.schedule_horizon = SCHEDULE_HORIZON_DAYS
+        self.schedule_order = SCHEDULE_ORDER
+        self._sync_state = None
+        self._busy_blocks = None
+        self._busy_window = None
+        self._stores = {}
+        self._executor = None
+        self._local = threading.local()
+        self._metadata_lock = threading.Lock()
+        self._fetch_lock = threading.Lock()
+
+        metadata = self._load_metadata()
+        if metadata is None:
+            self.refresh_metadata()
+        else:
+            self.name_to_id = metadata['name_to_id']
+            self.id_to_name = metadata['id_to_name']
+            self.timezone = metadata['timezone']
+            if time_module.time() - metadata.get('fetched_at', 0) > METADATA_TTL:
+                self.refresh_metadata(background=True)
+
+    @property
+    def zone(self):
+        """The ZoneInfo for the primary timezone (cached by get_zone)."""
+        return get_zone(self.timezone)
+
+    def refresh_metadata(self, background=False):
+        """
+        Fetch the calendar mappings and primary timezone from Google and cache them in METADATA_FILE.
+        With background=True and a service factory, the fetch runs on the worker pool and
+        the current values stay in use until it finishes.
+        """
+        if background and self.service_factory:
+            def refresh():
+                try:
+                    service = self._thread_service()
+                    name_to_id, id_to_name = self._build_maps(service)
+                    self._apply_metadata(name_to_id, id_to_name, self._get_primary_timezone(service))
+                except Exception as e:
+                    print(f"Error refreshing calendar metadata: {e}")
+            self._get_executor().submit(refresh)
+            return
+
+        if self.service_factory:
+            maps_future = self._get_executor().submit(lambda: self._build_maps(self._thread_service()))
+            timezone = self._get_primary_timezone()
+            name_to_id, id_to_name = maps_future.result()
+        else:
+            name_to_id, id_to_name = self._build_maps()
+            timezone = self._get_primary_timezone()
+        self._apply_metadata(name_to_id, id_to_name, timezone)
+
+    def _apply_metadata(self, name_to_id, id_to_name, timezone):
+        """Switch to freshly fetched metadata and write it to METADATA_FILE."""
+        with self._metadata_lock:
+            self.name_to_id, self.id_to_name, self.timezone = name_to_id, id_to_name, timezone
+        metadata = {
+            'name_to_id': name_to_id,
+            'id_to_name': id_to_name,
+            'timezone': timezone,
+            'fetched_at': time_module.time()
+        }
+        temp_path = METADATA_FILE + ".tmp"
+        with open(temp_path, 'w', encoding="utf-8") as f:
+            json.dump(metadata, f, indent=4)
+        os.replace(temp_path, METADATA_FILE)
+
+    def _load_metadata(self):
+        """Return the cached metadata, or None if there is no usable cache."""
+        if not os.path.exists(METADATA_FILE):
+            return None
+        with open(METADATA_FILE, 'r', encoding="utf-8") as f:
+            try:
+                metadata = json.load(f)
+            except json.JSONDecodeError:
+                return None
+        if not all(key in metadata for key in ('name_to_id', 'id_to_name', 'timezone')):
+            return None
+        return metadata
+
+    def _get_executor(self):
+        """Return the worker pool, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        return self._executor
+
+    def _thread_service(self):
+        """Return the calling worker's own service instance, building it on first use."""
+        service = getattr(self._local, 'service', None)
+        if service is None:
+            service = self.service_factory()
+            self._local.service = service
+        return service
+
+    def _service(self):
+        """
+        The service for requests made on the calling thread. httplib2 is not thread-safe, so
+        with a service factory every thread gets its own; without one, the shared service is used.
+        """
+        return self._thread_service() if self.service_factory else self.service
+
+    def _calendar_items(self):
+        """Snapshot of the (calendar name, calendar ID) pairs, safe against a background metadata refresh."""
+        with self._metadata_lock:
+            return list(self.name_to_id.items())
 
-    def _get_primary_timezone(self):
+    def _map_calendars(self, fn, calendars=None):
+        """
+        Call fn(service, calendar_name, calendar_id) for every (name, ID) pair in calendars
+        (a fresh snapshot if None) and return the results in the same order.
+        Runs on the worker pool when a service factory is set.
+        """
+        if calendars is None:
+            calendars = self._calendar_items()
+        if not self.service_factory or len(calendars) < 2:
+            return [fn(self._service(), name, calendar_id) for name, calendar_id in calendars]
+
+        futures = [
+            self._get_executor().submit(lambda n=name, c=calendar_id: fn(self._thread_service(), n, c))
+            for name, calendar_id in calendars
+        ]
+        return [future.result() for future in futures]
+
+    def _get_primary_timezone(self, service=None):
         """Fetch the primary calendar's timezone."""
+        service = service or self._service()
         try:
-            primary_cal = self.service.calendars().get(calendarId='primary').execute()
+            primary_cal = service.calendars().get(calendarId='primary').execute()
             return primary_cal.get('timeZone', 'America/Toronto')
         except Exception as e:
             print(f"Error fetching primary calendar timezone: {e}")
             return 'America/Toronto'
 
-    def _build_maps(self):
+    def _build_maps(self, service=None):
         """Fetch all calendars and build name-to-ID and ID-to-name mappings."""
-        calendars = self.service.calendarList().list().execute().get('items', [])
+        service = service or self._service()
+        calendars = []
+        page_token = None
+        while True:
+            result = service.calendarList().list(pageToken=page_token).execute()
+            calendars.extend(result.get('items', []))
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                break
         name_to_id = {c['summary']: c['id'] for c in calendars}
         id_to_name = {c['id']: c['summary'] for c in calendars}
         return name_to_id, id_to_name
@@ -40,51 +249,85 @@ class Calendar:
     def add_events(self, event_list):
         """Adds a list of events to the calendar."""
 
-        for event in event_list:
-            self._insert_event(event)
+        self.commit_events(to_add=event_list)
         
         print("All events added to calendar.")
         return event_list
 
-    def _insert_event(self, event):
-        """Add an Event instance to the appropriate calendar, with error handling."""
-        calendar_id = self.name_to_id.get(event.calendar_name, 'primary')
-        event_body = event.to_google_format(self.timezone)
+    def commit_events(self, to_add=(), to_delete=(), cancelled=None):
+        """
+        Insert and delete events using batched HTTP requests, sending up to
+        BATCH_SIZE operations per round trip. Deletes are queued before inserts.
 
-        try:
-            created_event = self.service.events().insert(
+        Parameters:
+            to_add (list[Event]): Events to insert. Inserted events get their new Google ID.
+            to_delete (list[Event]): Events to delete by ID.
+            cancelled (callable): Checked before each batch; once it returns True the
+                remaining operations are not sent and get COMMIT_CANCELLED as their error.
+        Returns:
+            results (list[dict]): One entry per event, in queue order, with keys
+            'action' ('insert' or 'delete'), 'event', 'id' and 'error' (None on success).
+        """
+        service = self._service()
+        results = []
+        operations = []
+
+        for event in to_delete:
+            result = {'action': 'delete', 'event': event, 'id': event.id, 'error': None}
+            results.append(result)
+            if event.id is None:
+                result['error'] = "Event has no ID"
+                continue
+            calendar_id = self.name_to_id.get(event.calendar_name, 'primary')
+            request = service.events().delete(calendarId=calendar_id, eventId=event.id)
+            operations.append((request, result))
+
+        for event in to_add:
+            result = {'action': 'insert', 'event': event, 'id': None, 'error': None}
+            results.append(result)
+            calendar_id = self.name_to_id.get(event.calendar_name, 'primary')
+            request = service.events().insert(
                 calendarId=calendar_id,
-                body=event_body
-            ).execute()
-
-            html_link = created_event.get('htmlLink', 'No link available')
-            return created_event
-
-        except HttpError as error:
-            error_details = error.content.decode("utf-8") if hasattr(error, "content") else str(error)
-            try:
-                print("Event body sent to API:")
-                print(json.dumps(event_body, indent=2))
-            except Exception:
-                pass
-            return None
-
-        except Exception as e:
-            print(f"❌ Unexpected error while creating event in '{event.calendar_name}': {e}")
-            return None
+                body=event.to_google_format(self.timezone)
+            )
+            operations.append((request, result))
+
+        for i in range(0, len(operations), BATCH_SIZE):
+            if cancelled and cancelled():
+                for _, result in operations[i:]:
+                    result['error'] = COMMIT_CANCELLED
+                break
+            self._execute_batch(service, operations[i:i + BATCH_SIZE])
+
+        for result in results:
+            if result['error'] and result['error'] != COMMIT_CANCELLED:
+                print(f"Error with {result['action']} of event '{result['event'].summary}': {result['error']}")
+        return results
+
+    def _execute_batch(self, service, operations):
+        """Send a list of (request, result) pairs as one batch request, filling in each result."""
+        def callback(request_id, response, exception):
+            result = operations[int(request_id)][1]
+            if exception is not None:
+                if isinstance(exception, HttpError) and hasattr(exception, "content"):
+                    result['error'] = exception.content.decode("utf-8")
+                else:
+                    result['error'] = str(exception)
+            elif result['action'] == 'insert':
+                result['id'] = response.get('id')
+                result['event'].id = result['id']
+
+        batch = service.new_batch_http_request(callback=callback)
+        for index, (request, _) in enumerate(operations):
+            batch.add(request, request_id=str(index))
 
-    def _remove_event(self, event):
-        """
-        Remove an event from the calendar by its ID.
-        """
-        calendar_id = self.name_to_id.get(event.calendar_name, 'primary')
         try:
-            self.service.events().delete(
-                calendarId=calendar_id,
-                eventId=event.id
-            ).execute()
+            batch.execute()
         except Exception as e:
-            print(f"Error deleting event {event.id}: {e}")
+            # The batch request itself failed, so none of its operations went through
+            for _, result in operations:
+                if result['error'] is None:
+                    result['error'] = str(e)
 
     def get_events(self, date):
         """
@@ -101,274 +344,522 @@ class Calendar:
         if isinstance(date, str):
             date = datetime.fromisoformat(date).date()
 
-        # Define time window for the day
-        day_start = datetime.combine(date, time(0, 0, tzinfo=ZoneInfo(self.timezone)))
-        day_end = datetime.combine(date, time(23, 59, tzinfo=ZoneInfo(self.timezone)))
+        return self.get_events_range(date, date)[date]
+
+    def get_events_range(self, start, end):
+        """
+        Retrieve events between two dates (inclusive) from all calendars.
+        Runs one paginated events().list per calendar for the whole window and
+        buckets the results by day locally, so a week costs one request per
+        calendar instead of one per calendar per day. Safe to call from several
+        threads: fetches (and the sync mirror they update) run one at a time.
+
+        Returns:
+            dict[date, list[Event]]: Events for every day in the window. An event
+            spanning several days appears in the bucket of each day it overlaps.
+        """
+        if isinstance(start, str):
+            start = datetime.fromisoformat(start).date()
+        if isinstance(end, str):
+            end = datetime.fromisoformat(end).date()
+
+        # Define time window, end is exclusive at midnight after the last day
+        window_start = datetime.combine(start, time(0, 0, tzinfo=self.zone))
+        window_end = datetime.combine(end + timedelta(days=1), time(0, 0, tzinfo=self.zone))
+
+        events_by_day = {}
+        current_date = start
+        while current_date <= end:
+            events_by_day[current_date] = []
+            current_date += timedelta(days=1)
+
+        def fetch(service, calendar_name, calendar_id):
+            return [
+                self._event_from_google(event_data, calendar_name)
+                for event_data in self._list_events(calendar_id, window_start, window_end, service)
+            ]
+
+        with self._fetch_lock:
+            if self.incremental_sync:
+                self.sync()
+                fetched = self._mirror_events(window_start, window_end)
+            else:
+                fetched = self._map_calendars(fetch)
+
+        # Place each event in every day of the window it overlaps, in one vectorized pass
+        batch = EventBatch([event for calendar_events in fetched for event in calendar_events], self.zone)
+        rows, day_offsets, _, _ = batch.day_segments(start, (end - start).days + 1)
+        for row, day_offset in zip(rows.tolist(), day_offsets.tolist()):
+            events_by_day[start + timedelta(days=day_offset)].append(batch.events[row])
+
+        return events_by_day
+
+    def sync(self):
+        """
+        Bring the local mirror up to date. Calendars with a stored sync token only
+        download changes since the last sync, others do a full sync.
+
+        Returns:
+            int: Number of changed or deleted events received.
+        """
+        state = self._load_sync_state()
+        # One snapshot both builds the jobs and pairs up their results
+        calendars = self._calendar_items()
+        results = self._map_calendars(
+            lambda service, name, calendar_id: self._sync_calendar(service, calendar_id, state.get(calendar_id)),
+            calendars
+        )
+
+        changed = 0
+        new_tokens = False
+        for (_, calendar_id), (entry, count) in zip(calendars, results):
+            new_tokens = new_tokens or state.get(calendar_id, {}).get('syncToken') != entry['syncToken']
+            state[calendar_id] = entry
+            changed += count
+
+        # Nothing to write when every calendar came back unchanged
+        if changed or new_tokens:
+            self._save_sync_state()
+        return changed
+
+    def _sync_calendar(self, service, calendar_id, entry):
+        """
+        Sync one calendar's mirror entry. Falls back to a full sync if there is no
+        token yet or Google reports it expired (410 Gone).
+
+        Returns:
+            tuple[dict, int]: The new entry and the number of items received.
+        """
+        entry = entry or {}
+        sync_token = entry.get('syncToken')
+        events = dict(entry.get('events', {})) if sync_token else {}
+
+        try:
+            items, next_sync_token = self._list_changes(service, calendar_id, sync_token)
+        except HttpError as error:
+            if error.resp.status != 410:
+                raise
+            print(f"Sync token expired for calendar {calendar_id}, doing a full resync.")
+            events = {}
+            items, next_sync_token = self._list_changes(service, calendar_id, None)
+
+        for item in items:
+            if item.get('status') == 'cancelled':
+                events.pop(item['id'], None)
+            else:
+                events[item['id']] = item
+
+        return {'syncToken': next_sync_token, 'events': events}, len(items)
+
+    def _list_changes(self, service, calendar_id, sync_token):
+        """
+        List every page of a calendar's events, either from scratch or since sync_token.
+
+        Returns:
+            tuple[list[dict], str]: Raw event resources (including cancelled ones) and the nextSyncToken.
+        """
+        params = {
+            'calendarId': calendar_id,
+            'singleEvents': True,
+            'showDeleted': True,
+            'maxResults': EVENTS_PAGE_SIZE,
+            'fields': SYNC_LIST_FIELDS,
+        }
+        if sync_token:
+            params['syncToken'] = sync_token
+        else:
+            now = datetime.now(self.zone)
+            params['timeMin'] = (now - timedelta(days=SYNC_LOOKBACK_DAYS)).isoformat()
+            params['timeMax'] = (now + timedelta(days=SYNC_LOOKAHEAD_DAYS)).isoformat()
+
+        items = []
+        page_token = None
+        while True:
+            result = service.events().list(pageToken=page_token, **params).execute()
+            items.extend(result.get('items', []))
+            page_token = result.get('nextPageToken')
+            if not page_token:
+                return items, result.get('nextSyncToken')
+
+    def _mirror_events(self, window_start, window_end):
+        """Return, per calendar, the mirrored events that overlap the given window."""
+        state = self._load_sync_state()
+        naive_start = window_start.replace(tzinfo=None)
+        naive_end = window_end.replace(tzinfo=None)
 
         all_events = []
+        for calendar_name, calendar_id in self._calendar_items():
+            calendar_events = []
+            for event_data in state.get(calendar_id, {}).get('events', {}).values():
+                event = self._event_from_google(event_data, calendar_name)
+                if not (event.start and event.end):
+                    continue
+                # All-day events come back as naive dates
+                if event.start.tzinfo is None:
+                    overlaps = event.start < naive_end and event.end > naive_start
+                else:
+                    overlaps = event.start < window_end and event.end > window_start
+                if overlaps:
+                    calendar_events.append(event)
+            calendar_events.sort(key=lambda e: e.start.isoformat())
+            all_events.append(calendar_events)
+        return all_events
 
-        for calendar_name, calendar_id in self.name_to_id.items():
-            events_result = self.service.events().list(
+    def _load_sync_state(self):
+        """Load the sync mirror from SYNC_FILE once per session."""
+        if self._sync_state is None:
+            self._sync_state = {}
+            if os.path.exists(SYNC_FILE):
+                with open(SYNC_FILE, 'r', encoding="utf-8") as f:
+                    try:
+                        self._sync_state = json.load(f)
+                    except json.JSONDecodeError:
+                        print(f"Error decoding {SYNC_FILE}, doing a full resync.")
+        return self._sync_state
+
+    def _save_sync_state(self):
+        """Write the sync mirror to SYNC_FILE, replacing the old file in one step."""
+        temp_path = SYNC_FILE + ".tmp"
+        with open(temp_path, 'w', encoding="utf-8") as f:
+            json.dump(self._sync_state, f)
+        os.replace(temp_path, SYNC_FILE)
+
+    def _list_events(self, calendar_id, time_min, time_max, service=None):
+        """Yield raw event resources for a calendar, following nextPageToken."""
+        service = service or self._service()
+        page_token = None
+        while True:
+            events_result = service.events().list(
                 calendarId=calendar_id,
-                timeMin=day_start.isoformat(),
-                timeMax=day_end.isoformat(),
+                timeMin=time_min.isoformat(),
+                timeMax=time_max.isoformat(),
                 singleEvents=True,
-                orderBy='startTime'
+                orderBy='startTime',
+                maxResults=EVENTS_PAGE_SIZE,
+                pageToken=page_token,
+                fields=EVENT_LIST_FIELDS
             ).execute()
 
-            for event_data in events_result.get('items', []):
-                start_info = event_data.get('start', {})
-                end_info = event_data.get('end', {})
-
-                event = Event(
-                    id=event_data.get('id'),
-                    summary=event_data.get('summary'),
-                    start=start_info.get('dateTime') or start_info.get('date'),
-                    end=end_info.get('dateTime') or end_info.get('date'),
-                    description=event_data.get('description'),
-                    location=event_data.get('location'),
-                    calendar_name=calendar_name
-                )
-                event.duration = ((event.end - event.start).total_seconds() / 60) if event.start and event.end else 60
-                all_events.append(event)
-
-        return all_events
+            yield from events_result.get('items', [])
+
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                break
+
+    def _event_from_google(self, event_data, calendar_name):
+        """Build an Event instance from a Google Calendar event resource."""
+        start_info = event_data.get('start', {})
+        end_info = event_data.get('end', {})
+
+        event = Event(
+            id=event_data.get('id'),
+            summary=event_data.get('summary'),
+            start=start_info.get('dateTime') or start_info.get('date'),
+            end=end_info.get('dateTime') or end_info.get('date'),
+            description=event_data.get('description'),
+            location=event_data.get('location'),
+            calendar_name=calendar_name
+        )
+        event.duration = ((event.end - event.start).total_seconds() / 60) if event.start and event.end else 60
+        return event
     
-    def save_events(self, event_list, filename="events.json"):
+    def get_store(self, filename=EVENTS_FILE):
+        """Return the event store for a JSON file, opening it on first use."""
+        if filename not in self._stores:
+            if self.storage == 'sqlite':
+                store = SQLiteEventStore(os.path.splitext(filename)[0] + ".db", timezone=self.timezone)
+                store.migrate_json(filename)
+            else:
+                store = EventStore(filename, timezone=self.timezone)
+            self._stores[filename] = store
+        return self._stores[filename]
+
+    @property
+    def store(self):
+        """The event store for events.json."""
+        return self.get_store()
+
+    def close(self):
+        """Write any pending event store changes and stop background work."""
+        for store in self._stores.values():
+            store.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+
+    def save_events(self, event_list, filename=EVENTS_FILE, event_types=None):
         """
-        Save events to a JSON file, merging with existing events if the file exists.
-        Event duplicates are removed based on event ID, and days are kept sorted.
+        Save events to the event store for a JSON file, merging with the events already stored.
+        Event duplicates are removed based on event ID (or summary and start), and the file is
+        written back by the store's write-behind flush with days kept sorted.
 
         Args:
             event_list (list[Event]): List of Event instances to save.
             filename (str): The name of the JSON file to save events to.
+            event_types (list[str]): Types already determined for event_list; classified here if None.
         """
-        newly_added = []
-        # Load existing events if the file exists
-        if os.path.exists(filename):
-            with open(filename, 'r') as f:
-                try:
-                    existing_events = json.load(f)
-                except json.JSONDecodeError:
-                    existing_events = {}
-        else:
-            existing_events = {}
-        
-        # Ensure existing_events is a dict
-        if not isinstance(existing_events, dict):
-            existing_events = {}
-
-        # Merge new events
-        for event in event_list:
-            # Grab event date, otherwise fallback to 'todo' bucket.
-            event_date = event.date.isoformat() if event.start else 'todo'
-
-            # Ensure the date key exists
-            if event_date not in existing_events:
-                existing_events[event_date] = []
-
-            # Remove duplicates by event ID, then add the new one
-            existing_events[event_date] = [
-                e for e in existing_events[event_date]
-                if not (
-                    (event.id is not None and e.get('id') == event.id)
-                    or (
-                        e.get('summary') == event.summary
-                        and (event.start and e.get('start') == event.start.isoformat())
-                    )
-                )
-            ]
-            newly_added.append(event)
-        
-        event_type = interpreter.determine_event_type(newly_added)
-        for ev, ev_type in zip(newly_added, event_type):
-            ev.event_type = ev_type
-            existing_events[ev.date.isoformat()].append(ev.to_dict())
-
-            # Sort events within the day by start time (None -> empty string)
-            existing_events[ev.date.isoformat()].sort(key=lambda x: x['start'] or "")
-        
-        # Sort the days themselves
-        existing_events = dict(sorted(existing_events.items()))
+        if not event_list:
+            return
+        store = self.get_store(filename)
 
-        # Save back to file
-        with open(filename, 'w') as f:
-            json.dump(existing_events, f, indent=4)
+        if event_types is None:
+            event_types = interpreter.determine_event_type(event_list)
+        for ev, ev_type in zip(event_list, event_types):
+            ev.event_type = ev_type
+            store.put(ev)
 
-    def schedule_events(self, new_events, existing_events):
+    def schedule_changes(self, new_events):
         """
-        Schedule new events against an existing calendar.
+        Incrementally schedule new events against the events in the store.
+        Busy time is only built for the days the change touches: the days of new timed
+        events, of displaced chores and of the slots tried for chores and todos.
+        Displaced chores are rescheduled as copies; stored events are never changed here.
 
         Parameters:
             new_events (list[Event]): Events being added (timed, chores, todos).
-            existing_events (list[Event]): Events already scheduled in the calendar.
         Returns:
-            scheduled_event_list (list[Event]): Updated list of all scheduled events.
-            to_add (list[Event]): Events to be added.
-            to_remove (list[Event]): Events to be removed (Old copies that were rescheduled).
+            ScheduleDelta: The events added and moved, the unplaceable ones and notes on conflicts.
         """
-        scheduled_event_list = existing_events.copy()
-        exist_length = len(existing_events)
+        delta = ScheduleDelta()
+        if self.remote_busy:
+            # One freebusy query covering the horizon and every new event's date
+            tz = self.zone
+            today = datetime.now(tz).date()
+            last_day = max([today + timedelta(days=self.schedule_horizon)] +
+                           [e.date + timedelta(days=1) for e in new_events if e.date])
+            self.query_busy(datetime.combine(today, time(0, 0), tzinfo=tz),
+                            datetime.combine(last_day, time(0, 0), tzinfo=tz))
+        busy = FreeBusyMap(self.timezone, loader=self._busy_events_on)
 
-        for e in scheduled_event_list:
-            print("Existing event: ", e.summary, e.event_type)
-        to_add = []
-        to_remove = []
         # Separate new events into types
         timed_events = [e for e in new_events if e.event_type == 'timed']
         chores = [e for e in new_events if e.event_type == 'chore']
         todos = [e for e in new_events if e.event_type == 'todo']
-        print("Final scheduled events amount 0: ", len(scheduled_event_list))
+        displaced = {}  # id(copy) -> (original chore, copy), for chores moved out of the way
+
         # Handle timed events first (may cause rescheduling of chores)
         for event in timed_events:
-            conflict = self._find_conflicting_events(event)
-            if conflict:
-                for c in conflict:
-                    print("Conflicting event found:", c.summary, c.event_type)
-                    if c.event_type == 'chore':
-                        print(f"Rescheduling chore '{c.summary}' due to conflict with timed event '{event.summary}'.")
-                        # Remove by ID instead of object identity
-                        scheduled_event_list = [e for e in scheduled_event_list if e.id != c.id]
-                        to_remove.append(c)
-                        chores.append(c)
-                    else:
-                        print(f"Timed event '{event.summary}' conflicts with another timed event; not rescheduling.")
-
-            to_add.append(event)
-        print("Final scheduled events amount 1: ", len(scheduled_event_list))
-
-        # Schedule chores
-        for chore in chores:
-            scheduled_chore = self._schedule_chore(chore, scheduled_event_list)
-            to_add.append(scheduled_chore)
-        print("Final scheduled events amount 2: ", len(scheduled_event_list))
-        # Schedule todos
-        for todo in todos:
-            scheduled_todo = self._schedule_todo(todo, scheduled_event_list)
-            to_add.append(scheduled_todo)
-        print("Final scheduled events amount 3: ", len(scheduled_event_list))
-        return scheduled_event_list, to_add, to_remove
-
-    def _read_events(self, timed_start, timed_end) -> list[Event]:
+            for c in self._find_conflicting_events(event):
+                if c.event_type != 'chore':
+                    delta.notes.append(f"'{event.summary}' overlaps '{c.summary}', which is not a chore, so it stays.")
+                elif not any(c is original for original, _ in displaced.values()):
+                    delta.notes.append(f"Moving '{c.summary}' to make room for '{event.summary}'.")
+                    busy.mark_free(c.start, c.end)
+                    moved = copy.copy(c)
+                    displaced[id(moved)] = (c, moved)
+            # Busy time on Google that no stored event accounts for can't be rescheduled, only reported
+            for block in self._unaccounted_busy_between(event.start, event.end):
+                delta.notes.append(f"'{event.summary}' overlaps busy time on '{block.calendar_name}'.")
+            busy.mark_busy(event.start, event.end)
+            delta.added.append(event)
+
+        # Place chores, todos and displaced chores in one pass
+        placed, unplaceable = self.schedule_batch(chores + todos + [moved for _, moved in displaced.values()], busy)
+        for event in placed:
+            if id(event) in displaced:
+                delta.moved.append(displaced[id(event)])
+            else:
+                delta.added.append(event)
+        for event in unplaceable:
+            if id(event) in displaced:
+                delta.notes.append(f"No free slot to move '{event.summary}' to; keeping it at its current time.")
+            else:
+                delta.unplaceable.append(event)
+        return delta
+
+    def _busy_events_on(self, day):
         """
-        Read events from events.json that overlap the given time window.
-        Returns a list of Event objects.
+        Stored events overlapping a local day, used to build that day's busy time.
+        With remote_busy, the freebusy time on the day that no stored event covers is included too.
         """
-        events = []
+        day_start = datetime.combine(day, time(0, 0), tzinfo=self.zone)
+        day_end = day_start + timedelta(days=1)
+        return self.store.events_between(day_start, day_end) + self._unaccounted_busy_between(day_start, day_end)
 
-        events_path = Path("events.json")
-        if not events_path.exists():
-            print("events.json file not found.")
-            return events
+    def query_busy(self, time_min=None, time_max=None, refresh=False):
+        """
+        Fetch busy blocks for every calendar in name_to_id with freebusy().query.
+        One request covers all calendars (FREEBUSY_MAX_CALENDARS per request) over
+        [time_min, time_max), by default today plus the scheduling horizon. The result
+        is kept for the session and reused while it covers the requested window; if any
+        request fails, the partial result is used but not kept, so the next call retries.
 
-        with open(events_path, 'r', encoding="utf-8") as f:
+        Returns:
+            IntervalIndex: BusyBlock instances indexed by start and end timestamps.
+        """
+        tz = self.zone
+        if time_min is None:
+            time_min = datetime.combine(datetime.now(tz).date(), time(0, 0), tzinfo=tz)
+        if time_max is None:
+            time_max = time_min + timedelta(days=self.schedule_horizon)
+        if (not refresh and self._busy_window is not None
+                and self._busy_window[0] <= time_min and time_max <= self._busy_window[1]):
+            return self._busy_blocks
+
+        service = self._service()
+        blocks = IntervalIndex()
+        complete = True
+        calendar_ids = [calendar_id for _, calendar_id in self._calendar_items()]
+        for i in range(0, len(calendar_ids), FREEBUSY_MAX_CALENDARS):
+            body = {
+                'timeMin': time_min.isoformat(),
+                'timeMax': time_max.isoformat(),
+                'timeZone': self.timezone,
+                'items': [{'id': calendar_id} for calendar_id in calendar_ids[i:i + FREEBUSY_MAX_CALENDARS]]
+            }
             try:
-                all_events = json.load(f)
-            except json.JSONDecodeError:
-                print("Error decoding events.json.")
-                return events
-
-        # Collect all date keys that fall within the time window
-        current_date = timed_start.date()
-        end_date = timed_end.date()
-        date_keys = []
-        while current_date <= end_date:
-            date_keys.append(current_date.isoformat())
-            current_date += timedelta(days=1)
-
-        # Only iterate over relevant date buckets
-        for date_key in date_keys:
-            if date_key not in all_events:
+                response = service.freebusy().query(body=body).execute()
+            except HttpError as e:
+                print(f"Error querying free/busy time: {e}")
+                complete = False
                 continue
 
-            for event_data in all_events[date_key]:
-                if not isinstance(event_data, dict):
-                    print("Skipping malformed event:", event_data)
-                    continue
-
-                print("Event: ", event_data.get('summary'), event_data.get('eventType'))
-                event = Event.from_dict(event_data, timezone=ZoneInfo(self.timezone))
-                print("Loaded event:", event.summary, "Type:", event.event_type)
-
-                # Only include if event overlaps the time window
-                if event.start and event.end:
-                    if event.start < timed_end and event.end > timed_start:
-                        events.append(event)
-
-        return events
+            for calendar_id, info in response.get('calendars', {}).items():
+                calendar_name = self.id_to_name.get(calendar_id, calendar_id)
+                for error in info.get('errors', []):
+                    print(f"Free/busy time unavailable for calendar '{calendar_name}': {error.get('reason')}")
+                for busy in info.get('busy', []):
+                    start = datetime.fromisoformat(busy['start'].replace('Z', '+00:00')).astimezone(tz)
+                    end = datetime.fromisoformat(busy['end'].replace('Z', '+00:00')).astimezone(tz)
+                    blocks.add(start.timestamp(), end.timestamp(), BusyBlock(start, end, calendar_name))
 
+        self._busy_blocks = blocks
+        self._busy_window = (time_min, time_max) if complete else None
+        return blocks
 
-    def _schedule_chore(self, event, existing_events):
+    def remote_busy_between(self, start, end):
         """
-        Schedule a chore (event with date but no time).
-        Places the event in the first available time slot on the given date
-        between 8 AM and 8 PM, avoiding conflicts with existing events.
+        Return the cached freebusy blocks overlapping [start, end), or [] unless remote_busy is set.
+        Blocks are only known inside the window last passed to query_busy.
         """
+        if not self.remote_busy:
+            return []
+        blocks = self._busy_blocks if self._busy_blocks is not None else self.query_busy()
+        return blocks.overlapping(start.timestamp(), end.timestamp())
 
-        date = event.date
-        day_start = datetime.combine(date, time(8, 0, tzinfo=ZoneInfo(self.timezone)))
-        day_end   = datetime.combine(date, time(20, 0, tzinfo=ZoneInfo(self.timezone)))
-
-        # Collect busy times from existing events on the same date
-        busy_times = []
-        for e in existing_events:
-            if e.date == date:
-                busy_times.append({"start": e.start, "end": e.end})
-
-
-        for b in busy_times:
-            print("Busy:", b["start"], b["start"].tzinfo)
-
-        busy_times.sort(key=lambda b: b["start"])
-
-        # Find the first available slot
-        slot_start = day_start
-        for busy in busy_times:
-            busy_start, busy_end = busy["start"], busy["end"]
-
-            # Check if there's enough time before the busy slot
-            gap_minutes = (busy_start - slot_start).total_seconds() / 60
+    def _unaccounted_busy_between(self, start, end):
+        """
+        Freebusy time overlapping [start, end) that no stored event covers.
+        freebusy reports the user's own events too, and those already count through the
+        store; subtracting them keeps a slot free once a displaced chore is marked free.
+        Returns the remaining pieces of each block as BusyBlocks.
+        """
+        remaining = []
+        for block in self.remote_busy_between(start, end):
+            pieces = [(block.start, block.end)]
+            for event in self._read_events(block.start, block.end):
+                if not (event.start and event.end):
+                    continue
+                # All-day events from Google are stored naive; read them as local time
+                event_start = aware(event.start, self.zone).astimezone(self.zone)
+                event_end = aware(event.end, self.zone).astimezone(self.zone)
+                if is_all_day(event_start, event_end):
+                    continue
+                pieces = [(piece_start, piece_end)
+                          for s, e in pieces
+                          for piece_start, piece_end in ((s, min(e, event_start)), (max(s, event_end), e))
+                          if piece_start < piece_end]
+            remaining.extend(BusyBlock(s, e, block.calendar_name) for s, e in pieces if s < end and e > start)
+        return remaining
+
+    def schedule_batch(self, pending, busy, working_hours=None, horizon_days=None, order=None):
+        """
+        Place chores and todos against a FreeBusyMap in a single pass.
+        Chores go in the first free slot on their own date; todos in the first free
+        slot within horizon_days of today. Each placement marks its slot busy.
 
-            if gap_minutes >= event.duration:
-                event.start = slot_start
-                event.end   = slot_start + timedelta(minutes=event.duration)
-                return event
+        Parameters:
+            pending (list[Event]): Chores and todos to place.
+            busy (FreeBusyMap): Busy time, updated as events are placed.
+            working_hours (tuple[time, time]): Daily window to place events in. Defaults to self.working_hours.
+            horizon_days (int): How many days ahead todos may go. Defaults to self.schedule_horizon.
+            order (str): 'longest' (longest first), 'deadline' (dated chores by date, then todos)
+                or 'arrival' (as given). Defaults to self.schedule_order.
+        Returns:
+            placed (list[Event]): Events given a start and end, in placement order.
+            unplaceable (list[Event]): Events left unchanged because nothing fit.
+        """
+        working_hours = working_hours or self.working_hours
+        if horizon_days is None:
+            horizon_days = self.schedule_horizon
+        order = order or self.schedule_order
+
+        if order == 'longest':
+            pending = sorted(pending, key=lambda e: -e.duration)
+        elif order == 'deadline':
+            pending = sorted(pending, key=lambda e: (e.event_type != 'chore', e.date or date.max, -e.duration))
+
+        placed = []
+        unplaceable = []
+        for event in pending:
+            if event.event_type == 'todo':
+                scheduled = self._schedule_todo(event, busy, working_hours, horizon_days)
+            else:
+                scheduled = self._schedule_chore(event, busy, working_hours)
+            if scheduled is None:
+                unplaceable.append(event)
+            else:
+                placed.append(scheduled)
+        return placed, unplaceable
 
-            # Move slot_start to the end of the busy period
-            slot_start = max(slot_start, busy_end)
+    def _read_events(self, timed_start, timed_end) -> list[Event]:
+        """
+        Read events from the event store that overlap the given time window.
+        Uses the store's interval index, so only overlapping events are returned.
+        """
+        return self.store.events_between(timed_start, timed_end)
 
-        # Check for a slot after the last busy period
-        gap_minutes = (day_end - slot_start).total_seconds() / 60
 
-        if gap_minutes >= event.duration:
-            event.start = slot_start
-            event.end   = slot_start + timedelta(minutes=event.duration)
-            return event
+    def _schedule_chore(self, event, busy, working_hours=None, day=None):
+        """
+        Schedule a chore (event with date but no time).
+        Places the event in the first available time slot on the given date (or day)
+        within working hours, avoiding busy time in the FreeBusyMap, and marks the
+        slot it takes as busy. Returns None, leaving the event unchanged, if nothing fits.
+        """
+        window_start, window_end = working_hours or self.working_hours
+        day = day or event.date
+        now = datetime.now(self.zone)
+        if day < now.date():
+            return None
+        if day == now.date():
+            # Don't place anything in the past; once the earliest start spills past
+            # midnight there is nothing left today (its time alone would wrap to this morning)
+            earliest = now + timedelta(minutes=busy.slot_minutes)
+            if earliest.date() != day:
+                return None
+            window_start = max(window_start, earliest.time().replace(second=0, microsecond=0))
+            if window_start >= window_end:
+                return None
+
+        slot_start = busy.first_fit(day, event.duration, window_start, window_end)
+        if slot_start is None:
+            return None
 
-        return event  # Return unscheduled if no slot found
+        event.date = day
+        event.start = slot_start
+        event.end   = slot_start + timedelta(minutes=event.duration)
+        busy.mark_busy(event.start, event.end)
+        return event
 
 
-    def _schedule_todo(self, event, event_list):
+    def _schedule_todo(self, event, busy, working_hours=None, horizon_days=None):
         """
         Schedule a todo task (Event with no date or time).
-        Places the event within the next 7 days in the first available time slot between 8 AM and 8 PM.
+        Places the event within the next horizon_days days in the first available time
+        slot within working hours. Returns None if no day has room.
         """
-        for i in range(7):
-            date = datetime.now() + timedelta(days=i)
-            event.date = date.date()
-            if self._schedule_chore(event, event_list):
+        if horizon_days is None:
+            horizon_days = self.schedule_horizon
+        today = datetime.now(self.zone).date()
+        for i in range(horizon_days):
+            if self._schedule_chore(event, busy, working_hours, day=today + timedelta(days=i)):
                 return event
-        print(f"No available slot found for todo '{event.summary}' in the next 7 days.")
-        return event
+        return None
 
     def _find_conflicting_events(self, timed_event):
         """
-        Returns conflicting chores to be rescheduled.
+        Returns the stored events overlapping a timed event; the chores among them get rescheduled.
         """
-        start = timed_event.start.astimezone(ZoneInfo(self.timezone))
-        end = timed_event.end.astimezone(ZoneInfo(self.timezone))
-
-        conflicting_events = self._read_events(start, end)
-        for event in conflicting_events:
-            print(f"Found conflicting event: {event.summary} ({event.start} - {event.end}), type: {event.event_type}")
-        return conflicting_events
+        start = timed_event.start.astimezone(self.zone)
+        end = timed_event.end.astimezone(self.zone)
+        return self._read_events(start, end)
@@ -0,0 +1,74 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+class DiskCache:
+    """
+    A small least-recently-used cache persisted to a JSON file.
+    Entries are loaded on first use and evicted oldest-first once max_entries is exceeded.
+    Safe to share between threads.
+    """
+    def __init__(self, filename, max_entries=1000):
+        self.filename = filename
+        self.max_entries = max_entries
+        self._entries = None
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.RLock()
+
+    def _load(self):
+        """Load the cache file once, ignoring a missing or corrupt file."""
+        if self._entries is None:
+            self._entries = OrderedDict()
+            if os.path.exists(self.filename):
+                with open(self.filename, 'r', encoding="utf-8") as f:
+                    try:
+                        self._entries = OrderedDict(json.load(f))
+                    except (json.JSONDecodeError, TypeError, ValueError):
+                        print(f"Error decoding {self.filename}, starting with an empty cache.")
+        return self._entries
+
+    def get(self, key, default=None):
+        """Return the cached value for key and mark it as recently used."""
+        with self._lock:
+            entries = self._load()
+            if key not in entries:
+                self.misses += 1
+                return default
+            self.hits += 1
+            entries.move_to_end(key)
+            return entries[key]
+
+    def set(self, key, value):
+        """Store a value, evicting the least recently used entries past max_entries."""
+        with self._lock:
+            entries = self._load()
+            entries[key] = value
+            entries.move_to_end(key)
+            while len(entries) > self.max_entries:
+                entries.popitem(last=False)
+
+    def remove_where(self, predicate):
+        """Remove every entry whose key matches predicate. Returns the number removed."""
+        with self._lock:
+            entries = self._load()
+            stale = [key for key in entries if predicate(key)]
+            for key in stale:
+                del entries[key]
+            return len(stale)
+
+    def stats(self):
+        """Return hit/miss counters and the current size, for sizing max_entries."""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'size': len(self._load()), 'max_entries': self.max_entries}
+
+    def save(self):
+        """Write the cache to disk, replacing the old file in one step."""
+        with self._lock:
+            entries = self._load()
+            temp_path = self.filename + ".tmp"
+            with open(temp_path, 'w', encoding="utf-8") as f:
+                json.dump(entries, f)
+            os.replace(temp_path, self.filename)
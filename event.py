@@ -1,11 +1,54 @@
 from datetime import datetime, date, timedelta
+from functools import lru_cache
+from itertools import count
+from sys import intern
 from zoneinfo import ZoneInfo
 
+
+@lru_cache(maxsize=None)
+def get_zone(key):
+    """Return the ZoneInfo for a timezone name, building each one only once."""
+    return ZoneInfo(key)
+
+
+# Source of the tokens that identify events not saved to Google Calendar yet
+_local_keys = count()
+
+
+def _zone(timezone):
+    return get_zone(timezone) if isinstance(timezone, str) else timezone
+
+
+def _parse_datetime(value, timezone):
+    """
+    Parse an ISO datetime string into the given timezone (naive values are assumed to be in it).
+    Returns the datetime, and the string if it still describes that datetime exactly (it has
+    an offset and the conversion kept it), else None, so to_dict knows when it may reuse it.
+    """
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        return (parsed.replace(tzinfo=timezone) if timezone else parsed), None
+    if timezone and parsed.tzinfo is not timezone:
+        converted = parsed.astimezone(timezone)
+        return converted, (value if converted.utcoffset() == parsed.utcoffset() else None)
+    return parsed, value
+
+
 class Event:
+    # Slots instead of a per-instance __dict__; this fixes the attribute set but saves no memory,
+    # as an event's size is mostly its datetimes and strings. _start_text/_end_text keep the ISO
+    # strings an event was loaded from, and _loaded_start/_loaded_end the datetimes parsed from
+    # them, so to_dict can reuse the strings while start and end have not been reassigned.
+    # _local_key is the token key() hands out while the event has no Google ID.
+    __slots__ = ('id', 'summary', 'date', 'start', 'end', 'duration', 'location', 'description',
+                 'calendar_name', 'event_type', '_start_text', '_end_text', '_loaded_start', '_loaded_end',
+                 '_local_key')
+
     def __init__(self, summary, _date=None, start=None, end=None,**kwargs):
         self.id = kwargs.get('id', None)
         self.summary = summary
         self.date = _date
+        timezone = _zone(kwargs.get('timezone'))
 
         # Normalize start
         if isinstance(start, str):
@@ -13,7 +56,7 @@ class Event:
         else:
             self.start = start
         if self.start and self.start.tzinfo is None:
-            self.start = self.start.replace(tzinfo=kwargs.get('timezone'))
+            self.start = self.start.replace(tzinfo=timezone)
 
         # Normalize end
         if isinstance(end, str):
@@ -21,7 +64,7 @@ class Event:
         else:
             self.end = end
         if self.end and self.end.tzinfo is None:
-            self.end = self.end.replace(tzinfo=kwargs.get('timezone'))
+            self.end = self.end.replace(tzinfo=timezone)
 
         self.duration = kwargs.get('duration', 60)
         if self.date is None and self.start:
@@ -31,56 +74,83 @@ class Event:
         self.description = kwargs.get('description', '')
         self.calendar_name = kwargs.get('calendar_name', 'primary')
         self.event_type = kwargs.get('event_type', None)
+        self._start_text = self._end_text = None
+        self._loaded_start = self._loaded_end = None
+        self._local_key = None
 
 
     @classmethod
-    def from_dict(cls, data, timezone=ZoneInfo('America/Toronto')):
-        """Create an Event instance from a dictionary (ignores event_type correctness)."""
-        start_time = None
-        end_time = None
+    def from_dict(cls, data, timezone='America/Toronto'):
+        """
+        Create an Event instance from a dictionary (ignores event_type correctness).
+        Fills the slots directly rather than going through __init__, parses each
+        datetime string once and keeps it for to_dict.
+        """
+        timezone = _zone(timezone)
+        event = cls.__new__(cls)
 
-        # Parse start time
         start_val = data.get('start')
         if start_val and 'T' in start_val:
-            start_time = datetime.fromisoformat(start_val)
-            if timezone:
-                if start_time.tzinfo is None:
-                    start_time = start_time.replace(tzinfo=timezone)
-                else:
-                    start_time = start_time.astimezone(timezone)
-
-        # Parse end time
+            event.start, event._start_text = _parse_datetime(start_val, timezone)
+            event._loaded_start = event.start
+        else:
+            event.start = event._loaded_start = event._start_text = None
+
         end_val = data.get('end')
         if end_val and 'T' in end_val:
-            end_time = datetime.fromisoformat(end_val)
-            if timezone:
-                if end_time.tzinfo is None:
-                    end_time = end_time.replace(tzinfo=timezone)
-                else:
-                    end_time = end_time.astimezone(timezone)
-
-        return cls(
-            summary=data.get('summary'),
-            date=data.get('date'),
-            start=start_time,
-            end=end_time,
-            duration=data.get('duration', 60),
-            location=data.get('location'),
-            description=data.get('description'),
-            calendar_name=data.get('calendarName', 'primary'),
-            event_type=data.get('eventType'),
-            id=data.get('id')
-        )
+            event.end, event._end_text = _parse_datetime(end_val, timezone)
+            event._loaded_end = event.end
+        else:
+            event.end = event._loaded_end = event._end_text = None
+
+        date_val = data.get('date')
+        if isinstance(date_val, str):
+            event.date = date.fromisoformat(date_val)
+        elif date_val is None and event.start:
+            event.date = event.start.date()
+        else:
+            event.date = date_val
+
+        event.id = data.get('id')
+        event.summary = data.get('summary')
+        event.duration = data.get('duration', 60)
+        event.location = data.get('location')
+        event.description = data.get('description')
+        # Calendar names and types repeat across events; share one string for each
+        calendar_name = data.get('calendarName', 'primary')
+        event.calendar_name = intern(calendar_name) if isinstance(calendar_name, str) else calendar_name
+        event_type = data.get('eventType')
+        event.event_type = intern(event_type) if isinstance(event_type, str) else event_type
+        event._local_key = None
+        return event
+
+    def key(self):
+        """
+        A stable identity for the event: its Google ID, or a token handed out on first
+        use that stays with this object (unlike id(), which can be reused after it is freed).
+        """
+        if self.id is not None:
+            return self.id
+        if self._local_key is None:
+            self._local_key = ('local', next(_local_keys))
+        return self._local_key
 
 
+    @staticmethod
+    def _iso(value, loaded, text):
+        # Reuse the loaded string while the datetime is still the one parsed from it
+        if value is None:
+            return None
+        return text if value is loaded and text is not None else value.isoformat()
+
     def to_dict(self):
         """Convert the Event instance to a dictionary."""
         return {
             'id': self.id,
             'summary': self.summary,
             'date': self.date.isoformat() if self.date else None,
-            'start': self.start.isoformat() if self.start else None,
-            'end': self.end.isoformat() if self.end else None,
+            'start': self._iso(self.start, self._loaded_start, self._start_text),
+            'end': self._iso(self.end, self._loaded_end, self._end_text),
             'duration': self.duration,
             'location': self.location,
             'description': self.description,
@@ -104,4 +174,4 @@ class Event:
             },
         }
         return event
-    
+
@@ -0,0 +1,93 @@
+from datetime import datetime, timedelta
+import numpy as np
+from event import get_zone
+
+MINUTES_PER_DAY = 24 * 60
+# Local wall-clock minutes are counted from this naive datetime
+LOCAL_EPOCH = datetime(1970, 1, 1)
+
+
+class EventBatch:
+    """
+    A column-oriented view of a list of events for splitting them into days.
+
+    Each event is a row of NumPy arrays:
+        start (int64): Epoch seconds; 0 for events without a time.
+        local_start, local_end (int64): Minutes since LOCAL_EPOCH in local wall-clock time,
+            so day boundaries stay at local midnight across DST changes.
+        timed (bool): Whether the event has a start. An event without an end is treated
+            as ending when it starts.
+    events keeps the original Event objects, so going back to Events is an index lookup
+    rather than a rebuild.
+    """
+    def __init__(self, events=(), timezone='America/Toronto'):
+        self.timezone = get_zone(timezone) if isinstance(timezone, str) else timezone
+        self.events = list(events)
+        count = len(self.events)
+
+        self.start = np.zeros(count, dtype=np.int64)
+        self.local_start = np.zeros(count, dtype=np.int64)
+        self.local_end = np.zeros(count, dtype=np.int64)
+        self.timed = np.zeros(count, dtype=bool)
+
+        for i, event in enumerate(self.events):
+            if event.start:
+                start, end = self._local(event.start), self._local(event.end or event.start)
+                self.start[i] = int(start.timestamp())
+                self.local_start[i] = (start.replace(tzinfo=None) - LOCAL_EPOCH) // timedelta(minutes=1)
+                self.local_end[i] = (end.replace(tzinfo=None) - LOCAL_EPOCH) // timedelta(minutes=1)
+                self.timed[i] = True
+
+    def _local(self, value):
+        # All-day events from Google have naive datetimes; treat them as local time
+        return value.replace(tzinfo=self.timezone) if value.tzinfo is None else value.astimezone(self.timezone)
+
+    def __len__(self):
+        return len(self.events)
+
+    def take(self, indices):
+        """Return a new batch holding only the given rows (an index array or boolean mask)."""
+        indices = np.asarray(indices)
+        if indices.dtype == bool:
+            indices = np.flatnonzero(indices)
+        batch = EventBatch.__new__(EventBatch)
+        batch.timezone = self.timezone
+        batch.events = [self.events[i] for i in indices]
+        for column in ('start', 'local_start', 'local_end', 'timed'):
+            setattr(batch, column, getattr(self, column)[indices])
+        return batch
+
+    def all_day(self):
+        """Mask of timed events running from local midnight to local midnight for a day or more."""
+        return (self.timed & (self.local_start % MINUTES_PER_DAY == 0) & (self.local_end % MINUTES_PER_DAY == 0)
+                & (self.local_end - self.local_start >= MINUTES_PER_DAY))
+
+    def sort(self, by='start'):
+        """Return a copy ordered by a column (stable, so ties keep their order)."""
+        return self.take(np.argsort(getattr(self, by), kind='stable'))
+
+    def day_segments(self, week_start, days=7):
+        """
+        Split timed events into one segment per local day they cover, clipped to the
+        days [week_start, week_start + days).
+        Returns arrays (row, day_offset, start_minute, end_minute), with day_offset counted
+        from week_start and minutes from local midnight; an event ending at midnight does
+        not produce an empty segment on the next day, and a zero-length event produces one
+        empty segment on its day.
+        """
+        rows = np.flatnonzero(self.timed & (self.local_end >= self.local_start))
+        first_day = self.local_start[rows] // MINUTES_PER_DAY
+        last_day = np.maximum(first_day, (self.local_end[rows] - 1) // MINUTES_PER_DAY)
+        counts = last_day - first_day + 1
+
+        # One entry per (event, day): repeat each row, then count up days within each event
+        row = np.repeat(rows, counts)
+        within = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        day = np.repeat(first_day, counts) + within
+        day_start = day * MINUTES_PER_DAY
+        start_minute = np.maximum(self.local_start[row], day_start) - day_start
+        end_minute = np.minimum(self.local_end[row], day_start + MINUTES_PER_DAY) - day_start
+
+        day_offset = day - (week_start - LOCAL_EPOCH.date()).days
+        keep = (day_offset >= 0) & (day_offset < days)
+        return row[keep], day_offset[keep].astype(np.int32), start_minute[keep], end_minute[keep]
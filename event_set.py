@@ -0,0 +1,82 @@
+class EventSet:
+    """
+    An insertion-ordered collection of events without duplicates.
+    Two events are duplicates if they share a Google event ID, or the same summary and start.
+    Both are kept as hash indexes, so membership, add, remove and replace are O(1).
+
+    The keys an event was indexed under are remembered, so an event that is changed in
+    place (a rescheduled chore) can still be removed; call reindex after changing it.
+    """
+    def __init__(self, events=()):
+        self._events = {}   # id(Event) -> Event, in insertion order
+        self._keys = {}     # id(Event) -> (event ID, (summary, start)) it was indexed under
+        self._by_id = {}    # event ID -> Event
+        self._by_key = {}   # (summary, start) -> Event
+        self.update(events)
+
+    @staticmethod
+    def _index_keys(event):
+        return event.id, (event.summary, event.start)
+
+    def __len__(self):
+        return len(self._events)
+
+    def __iter__(self):
+        return iter(list(self._events.values()))
+
+    def __contains__(self, event):
+        return self.find(event) is not None
+
+    def find(self, event):
+        """Return the stored event that is event or a duplicate of it, or None."""
+        stored = self._events.get(id(event))
+        if stored is not None:
+            return stored
+        event_id, key = self._index_keys(event)
+        if event_id is not None and event_id in self._by_id:
+            return self._by_id[event_id]
+        return self._by_key.get(key)
+
+    def add(self, event):
+        """Add an event unless it or a duplicate is already stored. Returns True if it was added."""
+        if event in self:
+            return False
+        event_id, key = self._index_keys(event)
+        self._events[id(event)] = event
+        self._keys[id(event)] = (event_id, key)
+        if event_id is not None:
+            self._by_id[event_id] = event
+        self._by_key[key] = event
+        return True
+
+    def update(self, events):
+        """Add several events, returning the ones that were not duplicates."""
+        return [event for event in events if self.add(event)]
+
+    def remove(self, event):
+        """Remove an event (or its stored duplicate). Returns the removed event, or None."""
+        stored = self.find(event)
+        if stored is None:
+            return None
+        del self._events[id(stored)]
+        event_id, key = self._keys.pop(id(stored))
+        if event_id is not None and self._by_id.get(event_id) is stored:
+            del self._by_id[event_id]
+        if self._by_key.get(key) is stored:
+            del self._by_key[key]
+        return stored
+
+    def replace(self, old, new):
+        """Swap old (or its stored duplicate) for new. Returns True if new was added."""
+        self.remove(old)
+        return self.add(new)
+
+    def reindex(self, event):
+        """Refresh the indexes of a stored event after its ID, summary or start changed."""
+        if id(event) in self._events:
+            self.remove(event)
+            self.add(event)
+
+    def to_list(self):
+        """Return the events as a list, in insertion order."""
+        return list(self._events.values())
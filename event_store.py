@@ -0,0 +1,436 @@
+import bisect
+import heapq
+import json
+import os
+import sqlite3
+import threading
+from operator import itemgetter
+from zoneinfo import ZoneInfo
+from event import Event
+
+# Seconds to wait after a change before writing, so a burst of saves becomes one write
+FLUSH_DELAY = 1.0
+# Intervals at least this long (all-day and multi-day events) are indexed apart from the rest
+LONG_ITEM_SECONDS = 24 * 60 * 60
+# SQLite condition selecting those rows; queries repeat it word for word so the partial index applies
+LONG_ROWS = f"end_ts - start_ts >= {LONG_ITEM_SECONDS}"
+
+
+def date_key(event):
+    """The date bucket an event is filed under ('todo' if it has no date)."""
+    return event.date.isoformat() if event.date else 'todo'
+
+
+def aware(value, timezone):
+    """All-day events from Google have naive datetimes; treat them as local time."""
+    return value.replace(tzinfo=timezone) if value.tzinfo is None else value
+
+
+class IntervalIndex:
+    """
+    Sorted start/end arrays over timed items, for overlap queries with bisect.
+    An item overlapping [start, end) must start before end and no earlier than
+    start minus the longest indexed duration, so a query only scans that slice:
+    O(log n + k) while durations stay bounded. Items lasting LONG_ITEM_SECONDS or
+    more (all-day and multi-day events) are kept in their own arrays, which are
+    scanned up to end on every query, so one of them can't widen every slice.
+    """
+    def __init__(self):
+        self._starts = []
+        self._ends = []
+        self._items = []
+        self._max_duration = 0
+        self._long_starts = []
+        self._long_ends = []
+        self._long_items = []
+
+    def __len__(self):
+        return len(self._items) + len(self._long_items)
+
+    def add(self, start, end, item):
+        """Index an item over [start, end), given as timestamps."""
+        if end - start >= LONG_ITEM_SECONDS:
+            starts, ends, items = self._long_starts, self._long_ends, self._long_items
+        else:
+            starts, ends, items = self._starts, self._ends, self._items
+            self._max_duration = max(self._max_duration, end - start)
+        position = bisect.bisect_right(starts, start)
+        starts.insert(position, start)
+        ends.insert(position, end)
+        items.insert(position, item)
+
+    def remove(self, start, item):
+        """Remove an item added with this start timestamp."""
+        for starts, ends, items in ((self._starts, self._ends, self._items),
+                                    (self._long_starts, self._long_ends, self._long_items)):
+            position = bisect.bisect_left(starts, start)
+            while position < len(starts) and starts[position] == start:
+                if items[position] is item:
+                    del starts[position], ends[position], items[position]
+                    return
+                position += 1
+
+    def overlapping(self, start, end):
+        """Return the items whose interval overlaps [start, end), ordered by start."""
+        low = bisect.bisect_left(self._starts, start - self._max_duration)
+        high = bisect.bisect_left(self._starts, end)
+        found = [(self._starts[i], self._items[i]) for i in range(low, high) if self._ends[i] > start]
+        long_high = bisect.bisect_left(self._long_starts, end)
+        long_found = [(self._long_starts[i], self._long_items[i]) for i in range(long_high)
+                      if self._long_ends[i] > start]
+        if long_found:
+            found = heapq.merge(found, long_found, key=itemgetter(0))
+        return [item for _, item in found]
+
+    def clear(self):
+        self._starts.clear()
+        self._ends.clear()
+        self._items.clear()
+        self._max_duration = 0
+        self._long_starts.clear()
+        self._long_ends.clear()
+        self._long_items.clear()
+
+
+class EventStore:
+    """
+    Events from a JSON file kept in memory, indexed by date and by ID.
+    The file is read once. Changes are written back by a background flush that
+    runs FLUSH_DELAY seconds after the first unsaved change, so several saves in
+    a row cost a single write. The file layout is the same dictionary of
+    ISO date -> list of event dicts that save_events always wrote.
+    """
+    def __init__(self, filename="events.json", timezone='America/Toronto', flush_delay=FLUSH_DELAY):
+        self.filename = filename
+        self.timezone = ZoneInfo(timezone)
+        self.flush_delay = flush_delay
+        self._by_date = {}      # date key -> list[Event]
+        self._by_id = {}        # event ID -> Event
+        self._date_keys = {}    # id(Event) -> date key it is filed under
+        self._intervals = {}    # id(Event) -> start timestamp it is indexed under
+        self._index = IntervalIndex()
+        self._lock = threading.RLock()
+        self._flush_timer = None
+        self._dirty = False
+        self._load()
+
+    def _load(self):
+        """Read the JSON file into the indexes."""
+        if not os.path.exists(self.filename):
+            return
+        with open(self.filename, 'r', encoding="utf-8") as f:
+            try:
+                data = json.load(f)
+            except json.JSONDecodeError:
+                print(f"Error decoding {self.filename}.")
+                return
+        if not isinstance(data, dict):
+            return
+
+        for day_events in data.values():
+            for event_data in day_events:
+                if not isinstance(event_data, dict):
+                    print("Skipping malformed event:", event_data)
+                    continue
+                self._insert(Event.from_dict(event_data, timezone=self.timezone))
+
+    def _insert(self, event):
+        key = date_key(event)
+        self._by_date.setdefault(key, []).append(event)
+        self._date_keys[id(event)] = key
+        if event.id is not None:
+            self._by_id[event.id] = event
+        if event.start and event.end:
+            start = aware(event.start, self.timezone).timestamp()
+            self._index.add(start, aware(event.end, self.timezone).timestamp(), event)
+            self._intervals[id(event)] = start
+
+    def _discard(self, event):
+        key = self._date_keys.pop(id(event), None)
+        if key is None:
+            return
+        bucket = self._by_date[key]
+        bucket.remove(event)
+        if not bucket:
+            del self._by_date[key]
+        if event.id is not None and self._by_id.get(event.id) is event:
+            del self._by_id[event.id]
+        if id(event) in self._intervals:
+            self._index.remove(self._intervals.pop(id(event)), event)
+
+    def put(self, event):
+        """
+        Add or update an event. Replaces the stored event with the same ID, or with the
+        same summary and start on that date. Re-files the event if it was already stored
+        and its date has changed since.
+        """
+        with self._lock:
+            self._discard(event)
+            if event.id is not None and event.id in self._by_id:
+                self._discard(self._by_id[event.id])
+
+            key = date_key(event)
+            # Compare instants, so the same start written with another offset still matches
+            start = aware(event.start, self.timezone) if event.start else None
+            for existing in list(self._by_date.get(key, [])):
+                if start and existing.summary == event.summary and existing.start \
+                        and aware(existing.start, self.timezone) == start:
+                    self._discard(existing)
+
+            self._insert(event)
+            self._mark_dirty()
+
+    def remove(self, event):
+        """Remove an event, matching it by identity or by ID."""
+        with self._lock:
+            if id(event) in self._date_keys:
+                self._discard(event)
+            elif event.id is not None and event.id in self._by_id:
+                self._discard(self._by_id[event.id])
+            else:
+                return
+            self._mark_dirty()
+
+    def get(self, event_id):
+        """Return the stored event with this ID, or None."""
+        with self._lock:
+            return self._by_id.get(event_id)
+
+    def events_on(self, day):
+        """Return the events filed under a date."""
+        with self._lock:
+            return list(self._by_date.get(day.isoformat(), []))
+
+    def events_between(self, start, end):
+        """Return timed events overlapping the window [start, end), ordered by start."""
+        with self._lock:
+            return self._index.overlapping(start.timestamp(), end.timestamp())
+
+    def all_events(self):
+        """Return every stored event."""
+        with self._lock:
+            return [event for bucket in self._by_date.values() for event in bucket]
+
+    def clear(self):
+        """Remove every event."""
+        with self._lock:
+            self._by_date.clear()
+            self._by_id.clear()
+            self._date_keys.clear()
+            self._intervals.clear()
+            self._index.clear()
+            self._mark_dirty()
+
+    def _mark_dirty(self):
+        """Schedule a write-behind flush unless one is already pending."""
+        self._dirty = True
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.flush_delay, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+
+    def flush(self):
+        """Write pending changes to the JSON file now."""
+        with self._lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            if not self._dirty:
+                return
+            data = {}
+            for key in sorted(self._by_date):
+                day_events = [event.to_dict() for event in self._by_date[key]]
+                # Sort events within the day by start time (None -> empty string)
+                day_events.sort(key=lambda x: x['start'] or "")
+                data[key] = day_events
+            self._dirty = False
+
+            temp_path = self.filename + ".tmp"
+            with open(temp_path, 'w', encoding="utf-8") as f:
+                json.dump(data, f, indent=4)
+            os.replace(temp_path, self.filename)
+
+    def close(self):
+        """Flush pending changes and stop the background timer."""
+        self.flush()
+
+
+class SQLiteEventStore:
+    """
+    Events stored in a SQLite database, with the same interface as EventStore.
+    Rows are indexed by ID, calendar, date, start and end, so range queries only
+    read the rows they need, and every change runs in its own transaction. Rows lasting
+    LONG_ITEM_SECONDS or more have their own partial index, as in IntervalIndex.
+    Events read from the database are kept in an identity map, so the same row
+    always comes back as the same Event object.
+    """
+    def __init__(self, filename="events.db", timezone='America/Toronto'):
+        self.filename = filename
+        self.timezone = ZoneInfo(timezone)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(filename, check_same_thread=False)
+        self._objects = {}      # row ID -> Event
+        self._row_ids = {}      # id(Event) -> row ID
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS events (
+                    row_id INTEGER PRIMARY KEY,
+                    id TEXT UNIQUE,
+                    calendar TEXT,
+                    date TEXT NOT NULL,
+                    summary TEXT,
+                    start TEXT,
+                    start_ts REAL,
+                    end_ts REAL,
+                    data TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_events_calendar ON events(calendar);
+                CREATE INDEX IF NOT EXISTS idx_events_date ON events(date);
+                CREATE INDEX IF NOT EXISTS idx_events_start ON events(start_ts);
+                CREATE INDEX IF NOT EXISTS idx_events_end ON events(end_ts);
+                CREATE INDEX IF NOT EXISTS idx_events_long ON events(start_ts) WHERE {LONG_ROWS};
+                CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+            """.replace("{LONG_ROWS}", LONG_ROWS))
+        row = self._conn.execute(f"SELECT MAX(end_ts - start_ts) FROM events WHERE NOT ({LONG_ROWS})").fetchone()
+        self._max_duration = row[0] or 0
+
+    def migrate_json(self, json_filename):
+        """
+        One-shot import of an events.json file written by EventStore or the old save_events.
+        Each file is only imported once; later calls are no-ops.
+        """
+        migration_key = f"migrated:{os.path.abspath(json_filename)}"
+        with self._lock:
+            if self._conn.execute("SELECT 1 FROM meta WHERE key = ?", (migration_key,)).fetchone():
+                return 0
+            if not os.path.exists(json_filename):
+                return 0
+            with open(json_filename, 'r', encoding="utf-8") as f:
+                try:
+                    data = json.load(f)
+                except json.JSONDecodeError:
+                    print(f"Error decoding {json_filename}, nothing migrated.")
+                    return 0
+
+            events = [
+                Event.from_dict(event_data, timezone=self.timezone)
+                for day_events in (data.values() if isinstance(data, dict) else [])
+                for event_data in day_events if isinstance(event_data, dict)
+            ]
+            with self._conn:
+                for event in events:
+                    self._put(event)
+                self._conn.execute("INSERT INTO meta (key, value) VALUES (?, ?)", (migration_key, str(len(events))))
+            return len(events)
+
+    def _timestamp(self, value):
+        return aware(value, self.timezone).timestamp() if value else None
+
+    def _event(self, row_id, data):
+        """Return the Event for a row, building it only the first time it is read."""
+        event = self._objects.get(row_id)
+        if event is None:
+            event = Event.from_dict(json.loads(data), timezone=self.timezone)
+            self._objects[row_id] = event
+            self._row_ids[id(event)] = row_id
+        return event
+
+    def _delete_row(self, row_id):
+        self._conn.execute("DELETE FROM events WHERE row_id = ?", (row_id,))
+        event = self._objects.pop(row_id, None)
+        if event is not None:
+            self._row_ids.pop(id(event), None)
+
+    def _put(self, event):
+        """Replace duplicates of an event and insert it. Must run inside a transaction."""
+        if id(event) in self._row_ids:
+            self._delete_row(self._row_ids[id(event)])
+        duplicates = []
+        if event.id is not None:
+            duplicates += self._conn.execute("SELECT row_id FROM events WHERE id = ?", (event.id,)).fetchall()
+        start_ts, end_ts = self._timestamp(event.start), self._timestamp(event.end)
+        if start_ts is not None:
+            # Match on the start instant; the stored text may be written with another offset
+            duplicates += self._conn.execute(
+                "SELECT row_id FROM events WHERE date = ? AND summary = ? AND start_ts = ?",
+                (date_key(event), event.summary, start_ts)
+            ).fetchall()
+        for (row_id,) in set(duplicates):
+            self._delete_row(row_id)
+
+        data = event.to_dict()
+        cursor = self._conn.execute(
+            "INSERT INTO events (id, calendar, date, summary, start, start_ts, end_ts, data) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (event.id, event.calendar_name, date_key(event), event.summary, data['start'],
+             start_ts, end_ts, json.dumps(data))
+        )
+        self._objects[cursor.lastrowid] = event
+        self._row_ids[id(event)] = cursor.lastrowid
+        if start_ts is not None and end_ts is not None and end_ts - start_ts < LONG_ITEM_SECONDS:
+            self._max_duration = max(self._max_duration, end_ts - start_ts)
+
+    def put(self, event):
+        """Add or update an event, replacing the row with the same ID or the same summary and start."""
+        with self._lock, self._conn:
+            self._put(event)
+
+    def remove(self, event):
+        """Remove an event, matching it by identity or by ID."""
+        with self._lock, self._conn:
+            if id(event) in self._row_ids:
+                self._delete_row(self._row_ids[id(event)])
+            elif event.id is not None:
+                row = self._conn.execute("SELECT row_id FROM events WHERE id = ?", (event.id,)).fetchone()
+                if row:
+                    self._delete_row(row[0])
+
+    def get(self, event_id):
+        """Return the stored event with this ID, or None."""
+        with self._lock:
+            row = self._conn.execute("SELECT row_id, data FROM events WHERE id = ?", (event_id,)).fetchone()
+            return self._event(*row) if row else None
+
+    def events_on(self, day):
+        """Return the events filed under a date."""
+        with self._lock:
+            rows = self._conn.execute("SELECT row_id, data FROM events WHERE date = ?", (day.isoformat(),))
+            return [self._event(*row) for row in rows]
+
+    def events_between(self, start, end):
+        """Return timed events overlapping the window [start, end)."""
+        start_ts, end_ts = start.timestamp(), end.timestamp()
+        with self._lock:
+            # The lower bound on start_ts lets SQLite range-scan the start index for
+            # short rows; long rows are read through their own index
+            rows = self._conn.execute(
+                f"SELECT row_id, data, start_ts FROM events "
+                f"WHERE start_ts >= ? AND start_ts < ? AND end_ts > ? AND NOT ({LONG_ROWS}) "
+                f"UNION ALL SELECT row_id, data, start_ts FROM events "
+                f"WHERE {LONG_ROWS} AND start_ts < ? AND end_ts > ? "
+                f"ORDER BY start_ts",
+                (start_ts - self._max_duration, end_ts, start_ts, end_ts, start_ts)
+            )
+            return [self._event(row_id, data) for row_id, data, _ in rows]
+
+    def all_events(self):
+        """Return every stored event."""
+        with self._lock:
+            rows = self._conn.execute("SELECT row_id, data FROM events ORDER BY date, start")
+            return [self._event(*row) for row in rows]
+
+    def clear(self):
+        """Remove every event."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM events")
+            self._objects.clear()
+            self._row_ids.clear()
+            self._max_duration = 0
+
+    def flush(self):
+        """Writes are committed as they happen, so there is nothing to flush."""
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,135 @@
+import math
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+import numpy as np
+from event_batch import EventBatch
+
+# Minutes per slot in the busy arrays
+SLOT_MINUTES = 1
+
+
+def is_all_day(start, end):
+    """All-day events run midnight to midnight; they don't block time slots."""
+    return (start.time() == time(0, 0) and end.time() == time(0, 0)
+            and (end - start) >= timedelta(days=1))
+
+
+class BusyBlock:
+    """A busy interval from the freebusy API; it has a start and end but no event details."""
+    __slots__ = ('start', 'end', 'calendar_name')
+    summary = "Busy"
+    event_type = None
+    date = None
+
+    def __init__(self, start, end, calendar_name=None):
+        self.start = start
+        self.end = end
+        self.calendar_name = calendar_name
+
+    def __repr__(self):
+        return f"BusyBlock({self.start} - {self.end}, {self.calendar_name})"
+
+
+class FreeBusyMap:
+    """
+    Per-day busy arrays at SLOT_MINUTES resolution, in the calendar's local wall-clock time.
+    Each slot counts the events covering it, so removing one of two overlapping events
+    leaves the slot busy. Finding a gap is a vectorized run-length search over the free slots.
+
+    If a loader is given, loader(day) is called the first time a day is used and must
+    return the events overlapping it, so only the days a change touches are ever built.
+    """
+    def __init__(self, timezone='America/Toronto', slot_minutes=SLOT_MINUTES, loader=None):
+        self.timezone = ZoneInfo(timezone) if isinstance(timezone, str) else timezone
+        self.slot_minutes = slot_minutes
+        self.slots_per_day = 24 * 60 // slot_minutes
+        self.loader = loader
+        self._days = {}     # date -> np.ndarray of busy counts
+
+    def day(self, day):
+        """Return the busy counts for a date, building it on first use."""
+        if day not in self._days:
+            self._days[day] = self._build_day(day, self.loader(day) if self.loader else [])
+        return self._days[day]
+
+    def _build_day(self, day, events):
+        """Busy counts for one day from its events, clipped to the day, with one vectorized pass."""
+        counts = np.zeros(self.slots_per_day + 1, dtype=np.int32)
+        if events:
+            batch = EventBatch(events, self.timezone)
+            rows, _, start_minutes, end_minutes = batch.day_segments(day, days=1)
+            keep = ~batch.all_day()[rows]
+            first = start_minutes[keep] // self.slot_minutes
+            last = -(-end_minutes[keep] // self.slot_minutes)
+            # +1 where each event starts, -1 where it ends; the running sum is the count
+            np.add.at(counts, first, 1)
+            np.add.at(counts, last, -1)
+        return np.cumsum(counts[:-1]).astype(np.uint8)
+
+    def loaded_days(self):
+        """Return the dates that have been built so far."""
+        return set(self._days)
+
+    def _local(self, value):
+        return value.replace(tzinfo=self.timezone) if value.tzinfo is None else value.astimezone(self.timezone)
+
+    def _update_day(self, slots, day, start, end, delta):
+        """Apply one event's [start, end) to a single day's slots, clipped to that day."""
+        if end <= start or is_all_day(start, end) or not (start.date() <= day <= end.date()):
+            return
+        first = 0
+        last = self.slots_per_day
+        if day == start.date():
+            first = (start.hour * 60 + start.minute) // self.slot_minutes
+        if day == end.date():
+            last = math.ceil((end.hour * 60 + end.minute) / self.slot_minutes)
+        if last > first:
+            window = slots[first:last]
+            if delta > 0:
+                window += 1
+            else:
+                np.subtract(window, 1, out=window, where=window > 0)
+
+    def _update(self, start, end, delta):
+        start, end = self._local(start), self._local(end)
+        day = start.date()
+        while day <= end.date():
+            self._update_day(self.day(day), day, start, end, delta)
+            day += timedelta(days=1)
+
+    def mark_busy(self, start, end):
+        """Mark [start, end) as busy."""
+        self._update(start, end, 1)
+
+    def mark_free(self, start, end):
+        """Undo an earlier mark_busy for [start, end)."""
+        self._update(start, end, -1)
+
+    def add_events(self, events):
+        """Mark every timed event as busy."""
+        for event in events:
+            if event.start and event.end:
+                self.mark_busy(event.start, event.end)
+
+    def first_fit(self, day, duration, window_start=time(8, 0), window_end=time(20, 0)):
+        """
+        Return the start of the first free gap of at least duration minutes on a date,
+        inside [window_start, window_end), or None if there is no such gap.
+        """
+        low = (window_start.hour * 60 + window_start.minute) // self.slot_minutes
+        high = (window_end.hour * 60 + window_end.minute) // self.slot_minutes
+        if window_end == time(0, 0):
+            high = self.slots_per_day
+        needed = max(1, math.ceil(duration / self.slot_minutes))
+
+        free = self.day(day)[low:high] == 0
+        # Run starts/ends are where the padded free mask flips
+        edges = np.diff(np.concatenate(([0], free.view(np.int8), [0])))
+        run_starts = np.flatnonzero(edges == 1)
+        run_ends = np.flatnonzero(edges == -1)
+        fits = np.flatnonzero(run_ends - run_starts >= needed)
+        if fits.size == 0:
+            return None
+
+        minutes = (low + int(run_starts[fits[0]])) * self.slot_minutes
+        return datetime.combine(day, time(minutes // 60, minutes % 60), tzinfo=self.timezone)
@@ -1,9 +1,15 @@
 import dearpygui.dearpygui as dpg
+import copy
 import os
+import time as time_module
 from event import Event
-from calendar_class import Calendar
+from event_set import EventSet
+from renderer import WeekRenderer
+from jobs import JobRunner
+from week_cache import WeekCache
+from calendar_class import Calendar, COMMIT_CANCELLED
 import interpreter
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 
 today = date.today()
 days_since_monday = today.weekday()  # how many days past Monday
@@ -23,6 +29,8 @@ in_table_color = (200, 200, 200, 155) # FADED LIGHT GREY
 
 TIME_COL_WIDTH = 60
 HEADER_HEIGHT = 40
+# Seconds the viewport size must stay unchanged before the layout is redone
+RESIZE_DEBOUNCE = 0.05
 
 calendar_colors = {}
 
@@ -33,26 +41,6 @@ def get_calendar_color(name):
         calendar_colors[name] = color
     return calendar_colors[name]
 
-def extend_without_duplicates(original_list, new_items):
-    for item in new_items:
-        if item.id not in {e.id for e in original_list}:
-            original_list.append(item)
-        elif item.summary not in {e.summary for e in original_list} and item.start not in {e.start for e in original_list}:
-            original_list.append(item)
-    return original_list
-
-def remove_duplicates(list_a, list_b):
-    ids_b = {item.id for item in list_b}
-    summaries_b = {item.summary for item in list_b}
-    starts_b = {item.start for item in list_b}
-
-    filtered_a = [
-        item for item in list_a
-        if item.id not in ids_b and
-           (item.summary not in summaries_b or item.start not in starts_b)
-    ]
-    return filtered_a
-    
 def adjust_input_height(sender, app_data):
     text = dpg.get_value(sender)
     lines = text.count("\n") + 1
@@ -66,7 +54,7 @@ def get_chat_wrap():
 
 GRID_METRICS = {}
     
-def run_interface(calendar: Calendar):
+def run_interface(calendar: Calendar, on_first_frame=None):
     calendar_names = calendar.get_calendar_names()
     calendar_colors = {name:  get_calendar_color(name) for name in calendar_names}
 
@@ -81,60 +69,94 @@ def run_interface(calendar: Calendar):
     font_path = os.path.join(BASE_DIR, "Fonts", "FindSansPro-Light.ttf")
 
     chat_text_items = []
-    event_list = []
+    event_list = EventSet()
 
     to_delete_events = []
     to_add_events = []
     already_added_events = []
 
+    # Interpretation, scheduling and Google Calendar requests run as background jobs.
+    # Their chat messages and UI updates come back through the job queue, drained every frame.
+    jobs = JobRunner()
+    # Prefetching has its own lane so it never queues ahead of chat work
+    prefetch_jobs = JobRunner(name="prefetch")
+    prefetching = {}        # week start -> its prefetch Job
+    unsaved_weeks = set()   # prefetched weeks not yet classified and stored
+    week_cache = WeekCache()
+
+    def chat(text, color=None):
+        """Add a message to the chat area. Only call this on the UI thread."""
+        item = dpg.add_text(text, parent="chat_message_area",
+                            color=color or ai_color, wrap=get_chat_wrap())
+        chat_text_items.append(item)
+        return item
+
+    def chat_error(e):
+        chat(f"Something went wrong: {e}")
+
+    def chat_cancelled():
+        chat("Cancelled.")
+
+    def cancel_jobs():
+        if not jobs.cancel_all():
+            chat("Nothing to cancel.")
+
     # -------------------------------
     # Message sending
     # -------------------------------
     def send_message(input_id, chat_area):
-        nonlocal event_list, to_add_events, to_delete_events
         text = dpg.get_value(input_id).strip()
         if text:
-            wrap = get_chat_wrap()
-            txt_user = dpg.add_text(f"{text}", parent=chat_area,
-                                    color=user_color, wrap=wrap)
-            chat_text_items.append(txt_user)
+            chat(f"{text}", color=user_color)
             dpg.set_value(input_id, "")
             dpg.configure_item(input_id, height=30)
-            print("1: ", len(event_list))
-
-            events = process_multiline_input(text)
-            event_list, to_add, to_delete = calendar.schedule_events(events, event_list)
-            for event in to_add:
-                print("Adding event from display:", event.summary, event.start)
-            print("2: ", len(event_list))
-
-            for event in to_delete:
-                print("Deleting event from display:", event.summary, event.start)
-            event_list = remove_duplicates(event_list, to_delete)
-            print("3: ", len(event_list))
-
-
-            for event in to_add:
-                txt_ai = dpg.add_text(
-                    f"{event.summary} scheduled on {event.start.strftime('%A, %B %d, %Y from %I:%M %p')} to {event.end.strftime('%I:%M %p')}",
-                    parent=chat_area, color=ai_color, wrap=wrap
-                )
-                chat_text_items.append(txt_ai)
-            print("4: ", len(event_list))
-
-            for event in to_add:
-                print("TO ADD: ", event.summary)
-
-            to_add_events.extend(to_add)
-            print("To add events count:", len(to_add_events))
-            to_delete_events.extend(to_delete)
-            event_list.extend(to_add)
-            # event_list = extend_without_duplicates(event_list, to_add)
-            draw_events(current_day)
-            calendar.save_events(event_list, filename="events.json")
+            jobs.submit("message", process_message, text, on_error=chat_error, on_cancel=chat_cancelled)
 
-            dpg.add_text("Any other events?", parent=chat_area,
-            color=ai_color, wrap=wrap)
+    def process_message(job, text):
+        """Background job: interpret a message, schedule the events and save them."""
+        lines = [line.strip() for line in text.splitlines() if line.strip()]
+        job.post(chat, f"Reading {len(lines)} request{'s' if len(lines) != 1 else ''}...")
+        events = process_multiline_input(job, lines)
+        job.check()
+        if not events:
+            job.post(chat, "Any other events?")
+            return
+
+        job.post(chat, "Finding free time...")
+        delta = calendar.schedule_changes(events)
+        job.check()
+        # From here on the change is applied, so the job runs to the end.
+        # Only new events and the copies of moved chores are saved (and classified); nothing on
+        # screen holds them yet, and the view only takes them over once they are stored.
+        for original, _ in delta.moved:
+            calendar.store.remove(original)
+        calendar.save_events(delta.added + [moved for _, moved in delta.moved], filename="events.json")
+        job.post(apply_delta, delta)
+        job.post(chat, "Any other events?")
+
+    def apply_delta(delta):
+        """Show a saved scheduling delta and queue it for Google Calendar (UI thread)."""
+        for note in delta.notes:
+            chat(note)
+        for event in delta.added + [moved for _, moved in delta.moved]:
+            chat(f"{event.summary} scheduled on {event.start.strftime('%A, %B %d, %Y from %I:%M %p')} to {event.end.strftime('%I:%M %p')}")
+        for event in delta.unplaceable:
+            chat(f"Couldn't find a free slot for {event.summary}.")
+
+        # Apply only the delta, swapping each moved chore's copy in for the original
+        event_list.update(delta.added)
+        to_add_events.extend(delta.added)
+        for original, moved in delta.moved:
+            event_list.replace(original, moved)
+            pending = next((i for i, e in enumerate(to_add_events) if e is original), None)
+            if pending is not None:
+                to_add_events[pending] = moved
+                continue
+            if original.id is not None:
+                # Already on Google Calendar: delete the old copy
+                to_delete_events.append(original)
+            to_add_events.append(moved)
+        draw_events(current_day)
 
 
     # -------------------------------
@@ -194,9 +216,10 @@ def run_interface(calendar: Calendar):
 
                 # Middle panel
                 with dpg.child_window(tag="calendar_window", border=True):
-                    # Just define the drawlist; actual drawing happens in _on_resize
+                    # Just define the drawlist; the grid is built once and laid out in apply_layout.
+                    # Grid lines and labels go in their own layer, under the per-week event layers.
                     with dpg.drawlist(tag="calendar_grid", width=800, height=600):
-                        pass
+                        dpg.add_draw_layer(tag="grid_layer")
                 
                 # Right button panel
                 with dpg.child_window(tag="button_panel", border=False):
@@ -237,11 +260,84 @@ def run_interface(calendar: Calendar):
                         height=35,
                         callback=lambda: add_events(to_add_events)  # define this function
                     )
+                    dpg.add_button(
+                        label="Cancel",
+                        width=-1,
+                        height=35,
+                        callback=lambda: cancel_jobs()
+                    )
 
+    grid_items = {}
+    def build_grid():
+        """Create the grid lines and labels once; layout_grid moves them to fit the window."""
+        days = 7
+        hours = 24
+        line_color = (200, 200, 200, 255)
+        grid_items["time_line"] = dpg.draw_line((0, 0), (0, 0), color=line_color, parent="grid_layer")
+        grid_items["day_lines"] = [dpg.draw_line((0, 0), (0, 0), color=line_color, parent="grid_layer")
+                                   for _ in range(days + 1)]
+        grid_items["top_line"] = dpg.draw_line((0, 0), (0, 0), color=line_color, parent="grid_layer")
+        grid_items["header_line"] = dpg.draw_line((0, 0), (0, 0), color=line_color, parent="grid_layer")
+        grid_items["hour_lines"] = [dpg.draw_line((0, 0), (0, 0), color=line_color, parent="grid_layer")
+                                    for _ in range(hours)]
+
+        dpg.draw_text((5, 10), "Time", size=16, color=date_color, parent="grid_layer")
+        # Row 0 → day labels, filled in by set_grid_week
+        grid_items["day_labels"] = [dpg.draw_text((0, 10), "", size=16, color=date_color, parent="grid_layer")
+                                    for _ in range(days)]
+        # Rows 1–24 → hour labels in first column
+        grid_items["hour_labels"] = []
+        for h_idx in range(hours):
+            hour_12 = ((h_idx+1) % 12) or 12
+            suffix = "AM" if (h_idx+1) < 12 else "PM"
+            label = f"{hour_12}:00{suffix}"
+            grid_items["hour_labels"].append(
+                dpg.draw_text((5, 0), label, size=16, color=time_color, parent="grid_layer"))
+
+    def set_grid_week(week_start):
+        """Show a week's dates in the day labels."""
+        for i, label_id in enumerate(grid_items["day_labels"]):
+            day = week_start + timedelta(days=i)
+            dpg.configure_item(label_id, text=day.strftime("%A\n%B %d"))
+
+    def layout_grid(m):
+        """Move the prebuilt grid items to the metrics in m."""
+        cal_width, grid_height = m["cal_width"], m["cal_height"]
+        header_height, time_col_width = m["header_height"], m["time_col_width"]
+        day_col_width, hour_height = m["day_col_width"], m["hour_height"]
+
+        # Vertical lines (time column + day columns)
+        dpg.configure_item(grid_items["time_line"], p1=(time_col_width, 0), p2=(time_col_width, grid_height))
+        for i, line_id in enumerate(grid_items["day_lines"]):
+            x = time_col_width + i * day_col_width
+            dpg.configure_item(line_id, p1=(x, 0), p2=(x, grid_height))
+        # Horizontal lines: top, header bottom, hour rows
+        dpg.configure_item(grid_items["top_line"], p1=(0, 0), p2=(cal_width, 0))
+        dpg.configure_item(grid_items["header_line"], p1=(0, header_height), p2=(cal_width, header_height))
+        for h_idx, line_id in enumerate(grid_items["hour_lines"]):
+            y = header_height + (h_idx + 1) * hour_height
+            dpg.configure_item(line_id, p1=(0, y), p2=(cal_width, y))
+
+        for i, label_id in enumerate(grid_items["day_labels"]):
+            dpg.configure_item(label_id, pos=(time_col_width + i * day_col_width + 5, 10))
+        for h_idx, label_id in enumerate(grid_items["hour_labels"]):
+            dpg.configure_item(label_id, pos=(5, header_height + h_idx * hour_height + 5))
+
+    # Viewport resize events only record that a layout is due; the render loop applies
+    # it once the size has stopped changing for RESIZE_DEBOUNCE seconds, at most once a frame.
+    resize_state = {"pending_since": None, "laid_out_size": None}
     def _on_resize(sender, app_data):
-        """Adjust layout on viewport resize. Also the initial draw."""
-        w = dpg.get_viewport_width() - 50
-        h = dpg.get_viewport_height() - 15
+        resize_state["pending_since"] = time_module.perf_counter()
+
+    def apply_layout():
+        """Adjust layout to the viewport size. Also the initial layout."""
+        resize_state["pending_since"] = None
+        size = (dpg.get_viewport_width(), dpg.get_viewport_height())
+        if size == resize_state["laid_out_size"]:
+            return
+        resize_state["laid_out_size"] = size
+        w = size[0] - 50
+        h = size[1] - 15
 
         # Resize main containers
         dpg.configure_item("main_window", width=w, height=h)
@@ -269,52 +365,14 @@ def run_interface(calendar: Calendar):
         day_col_width = (cal_width - time_col_width) / days
         hour_height = (grid_height - header_height) / hours
 
-        # Clear old drawings
-        dpg.delete_item("calendar_grid", children_only=True)
-
-        # Vertical lines (time column + day columns)
-        dpg.draw_line((time_col_width, 0), (time_col_width, grid_height),
-                    color=(200, 200, 200, 255), parent="calendar_grid")
-        for i in range(days + 1):
-            x = time_col_width + i * day_col_width
-            dpg.draw_line((x, 0), (x, grid_height), color=(200, 200, 200, 255), parent="calendar_grid")
-        # Horizontal lines
-        # Top line
-        dpg.draw_line((0, 0), (cal_width, 0), color=(200, 200, 200, 255), parent="calendar_grid")
-        # Header bottom line
-        dpg.draw_line((0, header_height), (cal_width, header_height), color=(200, 200, 200, 255), parent="calendar_grid")
-        # Hour rows
-        for h_idx in range(hours):
-            y = header_height + (h_idx + 1) * hour_height
-            dpg.draw_line((0, y), (cal_width, y), color=(200, 200, 200, 255), parent="calendar_grid")
-        
-        dpg.draw_text((5, 10), "Time", size=16, color=date_color, parent="calendar_grid")
-        # Row 0 → day labels
-        for i in range(days):
-            day = current_day + timedelta(days=i)
-            label = day.strftime("%A\n%B %d")
-            dpg.draw_text((time_col_width + i * day_col_width + 5, 10),
-                        label, size=16, color=date_color, parent="calendar_grid")
-
-        # Rows 1–24 → hour labels in first column
-        for h_idx in range(hours):
-            y = header_height + h_idx * hour_height
-            hour_12 = ((h_idx+1) % 12) or 12
-            suffix = "AM" if (h_idx+1) < 12 else "PM"
-            label = f"{hour_12}:00{suffix}"
-
-            dpg.draw_text((5, y + 5), label, size=16, color=time_color, parent="calendar_grid")
-
-
-
         GRID_METRICS.update({
             "cal_width": cal_width, "cal_height": grid_height,
             "header_height": header_height, "time_col_width": time_col_width,
             "hour_height": hour_height, "day_col_width": day_col_width
         })
-        # Redraw events
-        draw_events(current_day)
-        
+        layout_grid(GRID_METRICS)
+        # Move the drawn events to the new grid
+        week_renderer.relayout(GRID_METRICS)
         
         # Button panel
         dpg.configure_item("button_panel", width=w*0.15, height=cal_height)
@@ -324,109 +382,213 @@ def run_interface(calendar: Calendar):
             color = calendar_colors.get(legend, (100, 100, 100, 155))
             dpg.configure_item(f"legend_{color}", wrap=w*0.15 - 10)
 
-    drawn_events = []
+    week_renderer = WeekRenderer("calendar_grid", calendar_colors)
     def draw_events(current_day):
-        nonlocal event_list, drawn_events
-
-        # Clear only previously drawn event rectangles/text
-        for item_id in drawn_events:
-            if dpg.does_item_exist(item_id):
-                dpg.delete_item(item_id)
-        drawn_events.clear()
-
-        for event in event_list:
-            day_offset = (event.start.date() - current_day).days
-            if not (0 <= day_offset < 7):
-                continue
-            if event.start.date() != event.end.date():
-                event_span = (event.end.date() - event.start.date()).days
-                if event.end.hour == 0 and event.end.minute == 0:
-                    event_span -= 1
-                for day in range(event_span + 1):
-                    if day == 0:
-                        start_hour, start_min = event.start.hour, event.start.minute
-                        end_hour, end_min = 24, 0
-                    elif day == (event.end.date() - event.start.date()).days:
-                        start_hour, start_min = 0, 0
-                        end_hour, end_min = event.end.hour, event.end.minute
-                    else:
-                        start_hour, start_min = 0, 0
-                        end_hour, end_min = 24, 0
-                    create_rect_for_event(event, day_offset + day, start_hour, start_min, end_hour, end_min)
-            else:
-                start_hour, start_min = event.start.hour, event.start.minute
-                end_hour, end_min = event.end.hour, event.end.minute
-                create_rect_for_event(event, day_offset, start_hour, start_min, end_hour, end_min) 
-
-
-    def create_rect_for_event(event, day_offset, start_hour, start_min, end_hour, end_min):
-        m = GRID_METRICS
-
-        x1 = m["time_col_width"] + day_offset * m["day_col_width"]
-        x2 = m["time_col_width"] + (day_offset + 1) * m["day_col_width"]
-
-        y1 = m["header_height"] + start_hour * m["hour_height"] + (start_min / 60) * m["hour_height"]
-        y2 = m["header_height"] + end_hour * m["hour_height"] + (end_min / 60) * m["hour_height"]
-
-        color = calendar_colors.get(event.calendar_name, (100, 100, 100, 175))
-        rect_id = dpg.draw_rectangle((x1, y1), (x2, y2), color=color, fill=color, parent="calendar_grid")
-        text_id = dpg.draw_text((x1 + 5, y1 + 5), event.summary, size=16,
-                                color=(255, 255, 255, 255), parent="calendar_grid")
-
-        # Track what you just drew
-        drawn_events.extend([rect_id, text_id])
+        """Update the current week's event layer, only touching items that changed."""
+        week_renderer.render(current_day, event_list, GRID_METRICS, calendar.zone)
 
     def add_events(events):
         nonlocal to_add_events, to_delete_events
-        wrap = get_chat_wrap()
-        dpg.add_text("Adding to Google Calendar...", parent="chat_message_area",
-            color=ai_color, wrap=wrap)
-
-        for event in to_delete_events:
-            calendar._remove_event(event)
-        calendar.add_events(events)
-        to_add_events.clear()
-        to_delete_events.clear()
-        dpg.add_text("Done! Anything else?", parent="chat_message_area",
-            color=ai_color, wrap=wrap)
+        if not events and not to_delete_events:
+            chat("There is nothing new to add.")
+            return
+        chat("Adding to Google Calendar...")
+        # Hand the pending changes to the job; new ones can queue up meanwhile
+        pending_add, pending_delete = list(events), list(to_delete_events)
+        to_add_events = []
+        to_delete_events = []
+        jobs.submit("add", commit_changes, pending_add, pending_delete,
+                    on_error=chat_error, on_cancel=lambda: requeue(pending_add, pending_delete))
+
+    def commit_changes(job, pending_add, pending_delete):
+        """Background job: send queued inserts and deletes to Google Calendar."""
+        results = calendar.commit_events(to_add=pending_add, to_delete=pending_delete,
+                                         cancelled=lambda: job.cancelled)
+        unsent_add, unsent_delete, inserted = [], [], []
+        for result in results:
+            if result['error'] == COMMIT_CANCELLED:
+                (unsent_add if result['action'] == 'insert' else unsent_delete).append(result['event'])
+            elif result['error']:
+                job.post(chat, f"Could not {result['action']} '{result['event'].summary}'.")
+            elif result['action'] == 'insert':
+                inserted.append(result['event'])
+                job.post(chat, f"Added '{result['event'].summary}'.")
+        # Inserted events now have a Google ID to be found by
+        job.post(store_inserted, inserted)
+        if unsent_add or unsent_delete:
+            job.post(requeue, unsent_add, unsent_delete)
+            return
+        job.post(chat, "Done! Anything else?")
+
+    def store_inserted(events):
+        """Re-file events under the Google IDs they were just given, in the store and the list (UI thread)."""
+        for event in events:
+            calendar.store.put(event)
+            event_list.reindex(event)
+
+    def requeue(pending_add, pending_delete):
+        """Put back changes from a cancelled add so the next add sends them (UI thread)."""
+        to_add_events[:0] = pending_add
+        to_delete_events[:0] = pending_delete
+        chat(f"Cancelled; {len(pending_add) + len(pending_delete)} changes were not sent to Google Calendar.")
         
     def get_events(current_day):
-        nonlocal event_list
-        wrap = get_chat_wrap()
-        dpg.add_text(f"Fetching calendar data until {current_day + timedelta(days=7)}...", parent="chat_message_area",
-            color=ai_color, wrap=wrap)
-        for i in range(7):
-            already_added_events = calendar.get_events(current_day+timedelta(days=i))
-            calendar.save_events(already_added_events, filename="events.json")
-            event_list = extend_without_duplicates(event_list, already_added_events)
-        draw_events(current_day)
-        dpg.add_text("Events fetched and displayed.", parent="chat_message_area",
-            color=ai_color, wrap=wrap)
+        chat(f"Fetching calendar data until {current_day + timedelta(days=7)}...")
+        jobs.submit("fetch", fetch_events, current_day, on_error=chat_error, on_cancel=chat_cancelled)
+
+    def fetch_events(job, week_start):
+        """Background job: fetch a week from Google Calendar, classify and store it."""
+        fetched = fetch_week(week_start)
+        job.check()
+        job.post(chat, f"Found {len(fetched)} events, sorting them...")
+        calendar.save_events(fetched.to_list(), filename="events.json")
+        job.check()
+        job.post(show_fetched, fetched, week_start)
+
+    def fetch_week(week_start):
+        events_by_day = calendar.get_events_range(week_start, week_start + timedelta(days=6))
+        fetched = EventSet()
+        for day_events in events_by_day.values():
+            fetched.update(day_events)
+        return fetched
+
+    def show_fetched(fetched, week_start):
+        """Add a fetched week to the view and the week cache (UI thread)."""
+        cache_week(week_start, fetched)
+        unsaved_weeks.discard(week_start)
+        if week_start == current_day:
+            draw_events(current_day)
+        chat("Events fetched and displayed.")
+
+    def cache_week(week_start, fetched):
+        event_list.update(fetched)
+        for week, events in week_cache.put(week_start, fetched):
+            evict_week(week, events)
+
+    def prefetch_around(week_start):
+        """
+        Fetch a week and its neighbours on the prefetch lane unless they are cached or in flight.
+        Prefetches for weeks that are no longer around the shown one are cancelled.
+        """
+        wanted = [week_start, week_start - timedelta(days=7), week_start + timedelta(days=7)]
+        for week in list(prefetching):
+            if week not in wanted:
+                prefetching.pop(week).cancel()
+            elif prefetching[week].future.done():
+                del prefetching[week]
+        for week in wanted:
+            if week not in week_cache and week not in prefetching:
+                prefetching[week] = prefetch_jobs.submit(
+                    "prefetch", prefetch_week, week,
+                    on_error=lambda e, week=week: print(f"Error prefetching week of {week}: {e}"))
+
+    def prefetch_week(job, week_start):
+        """Background job (prefetch lane): fetch a week into the week cache, without classifying it."""
+        fetched = fetch_week(week_start)
+        job.check()
+        job.post(show_prefetched, fetched, week_start)
+
+    def show_prefetched(fetched, week_start):
+        """Cache a prefetched week; store it only once it is the week on screen (UI thread)."""
+        if week_start in week_cache:
+            return
+        cache_week(week_start, fetched)
+        unsaved_weeks.add(week_start)
+        if week_start == current_day:
+            draw_events(current_day)
+            store_week(week_start)
+
+    def store_week(week_start):
+        """Classify and store a prefetched week in the background, if it hasn't been yet."""
+        if week_start not in unsaved_weeks:
+            return
+        unsaved_weeks.discard(week_start)
+        events = week_cache.peek(week_start).to_list()
+        if not events:
+            return
+        jobs.submit("store", classify_events, events,
+                    on_cancel=lambda: unsaved_weeks.add(week_start))
+
+    def classify_events(job, events):
+        """
+        Background job: classify and store events without changing them.
+        The store gets typed copies here, so the next job on this lane already schedules
+        against the week; the events on screen get their types on the UI thread.
+        """
+        event_types = interpreter.determine_event_type(events)
+        job.check()
+        calendar.save_events([copy.copy(event) for event in events], "events.json", event_types)
+        job.post(apply_event_types, events, event_types)
+
+    def apply_event_types(events, event_types):
+        for event, event_type in zip(events, event_types):
+            event.event_type = event_type
+
+    def evict_week(week_start, events):
+        """Drop an evicted week's layer and the events only it was holding (UI thread)."""
+        unsaved_weeks.discard(week_start)
+        # The week on screen keeps its layer and events even if the cache let it go
+        if week_start == current_day:
+            return
+        week_renderer.drop(week_start)
+        pending = EventSet(to_add_events)
+        for event in events:
+            if event in pending or any(event in week_cache.peek(week) for week in week_cache.weeks()):
+                continue
+            event_list.remove(event)
+
+    def process_multiline_input(job, lines)-> list[Event]:
+        events, errors = interpreter.interpret_inputs(calendar_names, lines, timezone=calendar.zone)
+        for line, error in errors:
+            job.post(chat, f"Sorry, I couldn't understand \"{line}\" ({error}).")
+        return events
 
-    
-    def process_multiline_input(text)-> list[Event]:
-        lines = [line.strip() for line in text.splitlines() if line.strip()]
-        results = []
-        for line in lines:
-            event = interpreter.interpret_input(calendar_names, line)
-            results.append(event)
-        return results
 
+    def load_week(week_start):
+        """Add the stored events for a week to event_list with one range query."""
+        nonlocal event_list
+        window_start = datetime.combine(week_start, time(0, 0), tzinfo=calendar.zone)
+        week_events = calendar.store.events_between(window_start, window_start + timedelta(days=7))
+        event_list.update(week_events)
 
     def previous_week():
         global current_day
         current_day -= timedelta(days=7)
-        _on_resize(None, None)
+        show_week(current_day)
 
     def next_week():
         global current_day
         current_day += timedelta(days=7)
-        _on_resize(None, None)
+        show_week(current_day)
+
+    def show_week(week_start):
+        """Show a week from the week cache or the local store, then prefetch around it."""
+        cached = week_cache.get(week_start)
+        if cached is not None:
+            event_list.update(cached)
+            store_week(week_start)
+        else:
+            load_week(week_start)
+        set_grid_week(week_start)
+        draw_events(week_start)
+        prefetch_around(week_start)
 
     dpg.set_viewport_resize_callback(_on_resize)
-    _on_resize(None, None)
+    build_grid()
+    apply_layout()
+    show_week(current_day)
 
     dpg.set_primary_window("main_window", True)
+    if on_first_frame:
+        dpg.set_frame_callback(1, lambda: on_first_frame())
     dpg.show_viewport()
-    dpg.start_dearpygui()
-    dpg.destroy_context()
\ No newline at end of file
+    while dpg.is_dearpygui_running():
+        pending_since = resize_state["pending_since"]
+        if pending_since is not None and time_module.perf_counter() - pending_since >= RESIZE_DEBOUNCE:
+            apply_layout()
+        jobs.drain()
+        prefetch_jobs.drain()
+        dpg.render_dearpygui_frame()
+    jobs.shutdown()
+    prefetch_jobs.shutdown()
+    dpg.destroy_context()
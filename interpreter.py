@@ -1,20 +1,86 @@
-from openai import OpenAI
 import os
 import json
 import re
-from event import Event
+import hashlib
+from event import Event, get_zone
+from disk_cache import DiskCache
 from datetime import datetime, date, time, timedelta
-from dotenv import load_dotenv
-from dateparser.search import search_dates
+from concurrent.futures import ThreadPoolExecutor
+import threading
 
 
-load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-now = datetime.now()
-today = now.date()
+# The OpenAI client and dateparser are slow to import, so both are loaded on first use
+_client = None
+_client_lock = threading.Lock()
+
+EVENT_TYPES = ('timed', 'chore', 'todo')
+# Per-line interpretation pipeline settings
+INTERPRET_WORKERS = 4
+INTERPRET_TIMEOUT = 30
+INTERPRET_RETRIES = 2
+classification_cache = DiskCache("classification_cache.json", max_entries=5000)
+# Interpreted events, keyed by date so relative dates never outlive the day they were resolved on
+interpretation_cache = DiskCache("interpretation_cache.json", max_entries=500)
+
+# Local fast path: inputs parsed with at least this confidence skip the LLM
+LOCAL_CONFIDENCE_THRESHOLD = 0.6
+# Zone relative dates are resolved in when the caller doesn't pass the calendar's zone
+DEFAULT_TIMEZONE = 'America/Toronto'
+TIME_PATTERN = re.compile(
+    r"\b(?:(?P<at>at|@)\s*)?(?P<hour>\d{1,2})(?::(?P<minute>[0-5]\d))?\s*(?P<meridiem>[ap]\.?m\b\.?)?",
+    re.IGNORECASE
+)
+# A time range such as "2-4pm", "9-9:15" or "10 to 11am"; not part of a date like 2025-01-06
+TIME_RANGE_PATTERN = re.compile(
+    r"(?<![-/\d])\b(?:(?:at|@)\s*)?"
+    r"(?P<start_hour>\d{1,2})(?::(?P<start_minute>[0-5]\d))?\s*(?P<start_meridiem>[ap]\.?m\b\.?)?"
+    r"\s*(?:-|–|\bto\b)\s*"
+    r"(?P<end_hour>\d{1,2})(?::(?P<end_minute>[0-5]\d))?\s*(?P<end_meridiem>[ap]\.?m\b\.?)?(?![-/]?\d)",
+    re.IGNORECASE
+)
+DURATION_PATTERN = re.compile(
+    r"\b(?:for\s+)?(?P<amount>\d+(?:\.\d+)?)\s*(?P<unit>h|hrs?|hours?|m|mins?|minutes?)\b",
+    re.IGNORECASE
+)
+DATE_KEYWORD_PATTERN = re.compile(
+    r"\b(?:today|tonight|tomorrow|(?:mon|tues|wednes|thurs|fri|satur|sun)day|"
+    r"jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec|in \d+ (?:days?|weeks?))",
+    re.IGNORECASE
+)
+# A month name next to a relative day ("March tomorrow") is contradictory
+MONTH_PATTERN = re.compile(
+    r"\b(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?|aug(?:ust)?|"
+    r"sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\b",
+    re.IGNORECASE
+)
+RELATIVE_DAY_PATTERN = re.compile(
+    r"\b(?:today|tonight|tomorrow|(?:mon|tues|wednes|thurs|fri|satur|sun)day|in \d+ (?:days?|weeks?))\b",
+    re.IGNORECASE
+)
+# Wording the LLM rules treat specially, or that describes ranges and repeats
+AMBIGUOUS_PATTERN = re.compile(r"\b(?:next|every|each|until|between|from|after|before|or|and)\b", re.IGNORECASE)
+DANGLING_WORDS_PATTERN = re.compile(r"^(?:\s*\b(?:at|on|for|in|by|to)\b)+|(?:\b(?:at|on|for|in|by|to)\b\s*)+$", re.IGNORECASE)
+
+def get_client():
+    """Return the OpenAI client, loading .env and creating it on first use."""
+    global _client
+    with _client_lock:
+        if _client is None:
+            from dotenv import load_dotenv
+            from openai import OpenAI
+            load_dotenv()
+            _client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+    return _client
+
+
+def search_dates(text: str, **kwargs):
+    """dateparser.search.search_dates, imported on first use."""
+    from dateparser.search import search_dates as dateparser_search_dates
+    return dateparser_search_dates(text, **kwargs)
+
 
 def parse_date(text: str) -> date | None:
-    results = search_dates(text, settings={"RELATIVE_BASE": now, "PREFER_DATES_FROM": "future"})
+    results = search_dates(text, settings={"RELATIVE_BASE": datetime.now(), "PREFER_DATES_FROM": "future"})
     if results:
         # returns list of tuples [(matched_text, datetime_obj)]
         _, dt = results[0]
@@ -26,9 +92,10 @@ def clean_json(content: str) -> str:
     return re.sub(r"^```(?:json)?\n|\n```$", "", content.strip())
 
 
-def interpret_input(calendar_names: list[str], text: str) -> Event:
-    prompt = f"""
-You are an event interpreter. Today's date is {today}. 
+def interpretation_rules() -> str:
+    """Rules shared by the single and batch interpretation prompts."""
+    today = date.today()
+    return f"""You are an event interpreter. Today's date is {today}. 
 Extract structured calendar event details from natural language.
 
 Rules:
@@ -38,34 +105,395 @@ Rules:
 - If only a date is mentioned (e.g., "on Saturday"), set time fields to null.
 - If only a time is mentioned (e.g., "at 1"), assume it refers to today's date unless another date is specified.
 - If a time is mentioned without AM/PM, infer from context (e.g., "Lunch at 1" → 13:00).
-- If no date or time is mentioned, set those fields to null.
+- If no date or time is mentioned, set those fields to null."""
 
-Input: "{text}"
 
-Return a JSON object with these keys:
-- summary (string): title of the event
+def event_fields(calendar_names: list[str]) -> str:
+    """Description of the JSON keys expected for each interpreted event."""
+    return f"""- summary (string): title of the event
 - date (string in YYYY-MM-DD format): the event date, or null if not mentioned
 - start (string in YYYY-MM-DDTHH:MM:SS format): the event start time, or null if not mentioned
 - duration (int): the event duration in minutes, or an estimate if not mentioned
 - location (string): the event location, or an expected location if not mentioned, for example "Doctor's office" for a doctor's appointment
 - description (string): a short description of the event
-- calendarName (string): choose the most appropriate calendar from this list: {calendar_names}
+- calendarName (string): choose the most appropriate calendar from this list: {calendar_names}"""
 
-Respond with only the JSON object.
-"""
 
-    response = client.chat.completions.create(
+def complete(prompt: str, timeout: float | None = None) -> str:
+    """Send a single-message prompt to the model and return the stripped reply."""
+    response = get_client().chat.completions.create(
         model="gpt-4.1",
-        messages=[{"role": "user", "content": prompt}]
+        messages=[{"role": "user", "content": prompt}],
+        timeout=timeout
     )
     content = response.choices[0].message.content
     if content is None:
         raise ValueError("OpenAI API returned None content")
-    content = content.strip()
+    return content.strip()
+
+
+def with_meridiem(hour: int, meridiem: str) -> int:
+    """24-hour value of an hour followed by 'a', 'p' or nothing (am/pm)."""
+    if meridiem == 'p' and hour < 12:
+        return hour + 12
+    if meridiem == 'a' and hour == 12:
+        return 0
+    return hour
+
+
+def range_times(match) -> tuple[time, time, bool] | None:
+    """
+    Start and end of a TIME_RANGE_PATTERN match. A missing am/pm is taken from the other
+    end ("2-4pm"), or inferred like a single time with the end after the start ("9-5").
+
+    Returns:
+        (start, end, inferred): inferred is True if neither end gave am/pm.
+        None if the range is not a valid pair of times on one day.
+    """
+    start_hour, end_hour = int(match.group('start_hour')), int(match.group('end_hour'))
+    start_minute = int(match.group('start_minute') or 0)
+    end_minute = int(match.group('end_minute') or 0)
+    start_meridiem = (match.group('start_meridiem') or "")[:1].lower()
+    end_meridiem = (match.group('end_meridiem') or "")[:1].lower()
+    if start_hour > 23 or end_hour > 23:
+        return None
+
+    inferred = not start_meridiem and not end_meridiem
+    if start_meridiem:
+        start = with_meridiem(start_hour, start_meridiem)
+    elif end_meridiem:
+        # "2-4pm" is 2pm; "11-1pm" is 11am
+        start = with_meridiem(start_hour, end_meridiem)
+        if (start, start_minute) >= (with_meridiem(end_hour, end_meridiem), end_minute):
+            start = with_meridiem(start_hour, 'a' if end_meridiem == 'p' else 'p')
+    else:
+        # Same inference as a single time: "1-3" is 13:00 to 15:00
+        start = start_hour + 12 if 1 <= start_hour <= 7 else start_hour
+    end = with_meridiem(end_hour, end_meridiem)
+    if not end_meridiem and (end, end_minute) <= (start, start_minute) and end < 12:
+        end += 12
+
+    if (end, end_minute) <= (start, start_minute):
+        return None
+    return time(start, start_minute), time(end, end_minute), inferred
+
+
+def parse_locally(calendar_names: list[str], text: str, timezone=None) -> tuple[Event | None, float]:
+    """
+    Deterministic parser for simple inputs such as "Lunch at 1 tomorrow" or
+    "Groceries on Saturday 45 min". Matches times, time ranges ("2-4pm"), durations and calendar names with
+    compiled patterns and dates with dateparser. Relative dates are resolved against
+    the current time in timezone (the calendar's zone; DEFAULT_TIMEZONE if not given).
+
+    Returns:
+        event (Event | None): The parsed event, or None if the input could not be parsed.
+        confidence (float): 0 to 1. Inputs below LOCAL_CONFIDENCE_THRESHOLD should go to the LLM.
+    """
+    timezone = timezone or get_zone(DEFAULT_TIMEZONE)
+    confidence = 1.0
+    remaining = text
+    if AMBIGUOUS_PATTERN.search(text):
+        confidence *= 0.4
+    if MONTH_PATTERN.search(text) and RELATIVE_DAY_PATTERN.search(text):
+        confidence *= 0.3
+
+    # Time range, which gives both the start and the duration
+    start_time = None
+    range_minutes = None
+    ranges = list(TIME_RANGE_PATTERN.finditer(remaining))
+    if ranges:
+        match = ranges[0]
+        times = range_times(match)
+        if times is None:
+            confidence *= 0.4
+        else:
+            start_time, end_time, inferred = times
+            range_minutes = (end_time.hour * 60 + end_time.minute) - (start_time.hour * 60 + start_time.minute)
+            if inferred:
+                confidence *= 0.85
+        remaining = remaining[:match.start()] + " " + remaining[match.end():]
+        if len(ranges) > 1:
+            confidence *= 0.4
+
+    # Duration
+    duration = None
+    durations = list(DURATION_PATTERN.finditer(remaining))
+    if durations:
+        match = durations[0]
+        amount = float(match.group('amount'))
+        duration = int(amount * 60) if match.group('unit').lower().startswith('h') else int(amount)
+        remaining = remaining[:match.start()] + " " + remaining[match.end():]
+        if len(durations) > 1:
+            confidence *= 0.4
+    if range_minutes is not None:
+        if duration is not None and duration != range_minutes:
+            # "2-4pm for 30 min" contradicts itself
+            confidence *= 0.4
+        duration = range_minutes
+
+    # Time of day, only counted when it reads like a time ("at 1", "1:30", "3pm")
+    times = [
+        m for m in TIME_PATTERN.finditer(remaining)
+        if (m.group('at') or m.group('minute') or m.group('meridiem')) and int(m.group('hour')) <= 23
+    ] if not ranges else []
+    if times:
+        match = times[0]
+        hour = int(match.group('hour'))
+        minute = int(match.group('minute') or 0)
+        meridiem = (match.group('meridiem') or "")[:1].lower()
+        if meridiem:
+            hour = with_meridiem(hour, meridiem)
+        elif 1 <= hour <= 7:
+            # Same inference the LLM is asked to make: "Lunch at 1" means 13:00
+            hour += 12
+            confidence *= 0.85
+        elif 8 <= hour <= 11:
+            confidence *= 0.85
+        start_time = time(hour, minute)
+        remaining = remaining[:match.start()] + " " + remaining[match.end():]
+        if len(times) > 1:
+            confidence *= 0.4
+
+    # Calendar name keywords. A bare name stays in the summary ("Work shift"); only
+    # wording like "in my Work calendar" is taken out.
+    calendar_name = None
+    for name in sorted(calendar_names, key=len, reverse=True):
+        pattern = re.compile(rf"\b(?P<prefix>(?:(?:in|on|to)\s+)?(?:my\s+)?){re.escape(name)}(?P<suffix>\s+calendar)?\b",
+                             re.IGNORECASE)
+        match = pattern.search(remaining)
+        if match:
+            calendar_name = name
+            if match.group('prefix') or match.group('suffix'):
+                remaining = remaining[:match.start()] + " " + remaining[match.end():]
+            break
+    if calendar_name is None:
+        confidence *= 0.9
+
+    # Date
+    now = datetime.now(timezone).replace(tzinfo=None)
+    today = now.date()
+    event_date = None
+    dates = search_dates(remaining, languages=['en'],
+                         settings={"RELATIVE_BASE": now, "PREFER_DATES_FROM": "future"}) or []
+    if dates:
+        matched_text, dt = dates[0]
+        event_date = dt.date()
+        remaining = remaining.replace(matched_text, " ", 1)
+        if len(dates) > 1 or not DATE_KEYWORD_PATTERN.search(matched_text):
+            confidence *= 0.4
+        if event_date.strftime("%A").lower() in matched_text.lower() and event_date - today == timedelta(days=7):
+            # "on Saturday" said on a Saturday could mean today
+            confidence *= 0.5
+    elif start_time:
+        event_date = today
+
+    summary = DANGLING_WORDS_PATTERN.sub("", " ".join(remaining.split())).strip(" ,.-")
+    if not summary:
+        return None, 0.0
+    if re.search(r"\d", summary):
+        # Numbers the patterns did not understand
+        confidence *= 0.5
+    if len(summary.split()) > 6:
+        confidence *= 0.7
+    if duration is None:
+        # The LLM estimates durations; the local default is only a good guess for timed events
+        confidence *= 0.95 if start_time else 0.6
+        duration = 60
+
+    start = datetime.combine(event_date, start_time) if start_time else None
+    event = Event(
+        summary=summary[0].upper() + summary[1:],
+        _date=event_date,
+        start=start,
+        duration=duration,
+        location='',
+        description=summary,
+        calendar_name=calendar_name or 'primary',
+        timezone=timezone
+    )
+    event.end = event.start + timedelta(minutes=duration) if event.start else None
+    if event.start:
+        event.event_type = 'timed'
+    elif event.date:
+        event.event_type = 'chore'
+    else:
+        event.event_type = 'todo'
+    return event, confidence
+
+
+def interpretation_key(calendar_names: list[str], text: str) -> str:
+    """Cache key for an interpretation: today's date, the calendar names and the normalized input."""
+    normalized = " ".join(text.lower().split()).strip(" .!?")
+    names = "\x1f".join(sorted(calendar_names))
+    digest = hashlib.sha256(f"{names}\x00{normalized}".encode("utf-8")).hexdigest()
+    return f"{date.today().isoformat()}:{digest}"
+
+
+def cached_interpretation(calendar_names: list[str], text: str) -> dict | None:
+    """Return the model's earlier answer for this input today, dropping entries from previous days."""
+    prefix = f"{date.today().isoformat()}:"
+    if interpretation_cache.remove_where(lambda key: not key.startswith(prefix)):
+        interpretation_cache.save()
+    return interpretation_cache.get(interpretation_key(calendar_names, text))
+
+
+def cache_interpretation(calendar_names: list[str], text: str, event_data: dict):
+    """Remember the model's answer for this input until midnight."""
+    interpretation_cache.set(interpretation_key(calendar_names, text), event_data)
+    interpretation_cache.save()
+
 
+def interpret_input(calendar_names: list[str], text: str, timeout: float | None = None,
+                    allow_local: bool = True, timezone=None) -> Event:
+    if allow_local:
+        event, confidence = parse_locally(calendar_names, text, timezone)
+        if event and confidence >= LOCAL_CONFIDENCE_THRESHOLD:
+            return event
+
+    event_data = cached_interpretation(calendar_names, text)
+    if event_data is not None:
+        return build_event(event_data, text)
+
+    prompt = f"""
+{interpretation_rules()}
+
+Input: "{text}"
+
+Return a JSON object with these keys:
+{event_fields(calendar_names)}
+
+Respond with only the JSON object.
+"""
+
+    content = complete(prompt, timeout=timeout)
     cleaned = clean_json(content)
     event_data = json.loads(cleaned)
 
+    event = build_event(event_data, text)
+    cache_interpretation(calendar_names, text, event_data)
+    return event
+
+
+def interpret_inputs(calendar_names: list[str], texts: list[str],
+                     timezone=None) -> tuple[list[Event], list[tuple[str, str]]]:
+    """
+    Interpret several inputs. Simple inputs are handled by parse_locally and inputs seen
+    earlier today come from the interpretation cache. The rest go to
+    the model in one request that returns a JSON array with one event per input, in input
+    order. Inputs whose item is missing or fails validation are interpreted again on
+    their own through interpret_concurrently. timezone is the calendar's zone, used to
+    resolve relative dates locally.
+
+    Returns:
+        events (list[Event]): Interpreted events, in input order.
+        errors (list[tuple[str, str]]): (input, error message) for inputs that could not be interpreted.
+    """
+    results = [None] * len(texts)
+    for i, text in enumerate(texts):
+        event, confidence = parse_locally(calendar_names, text, timezone)
+        if event and confidence >= LOCAL_CONFIDENCE_THRESHOLD:
+            results[i] = event
+            continue
+        event_data = cached_interpretation(calendar_names, text)
+        if event_data is not None:
+            results[i] = build_event(event_data, text)
+    llm_indexes = [i for i, event in enumerate(results) if event is None]
+
+    items = []
+    if len(llm_indexes) > 1:
+        inputs = "\n".join(f"{n + 1}. {json.dumps(texts[i])}" for n, i in enumerate(llm_indexes))
+        prompt = f"""
+{interpretation_rules()}
+
+Inputs (one event per line):
+{inputs}
+
+Return a JSON array with exactly {len(llm_indexes)} objects, one per input and in the same order, each with these keys:
+{event_fields(calendar_names)}
+
+Respond with only the JSON array.
+"""
+        try:
+            items = json.loads(clean_json(complete(prompt, timeout=INTERPRET_TIMEOUT * len(llm_indexes))))
+        except Exception as e:
+            print(f"Batch interpretation failed, interpreting each input separately: {e}")
+        if not isinstance(items, list) or len(items) != len(llm_indexes):
+            items = []
+
+    for n, i in enumerate(llm_indexes):
+        if n < len(items) and is_valid_event_data(items[n]):
+            try:
+                results[i] = build_event(items[n], texts[i])
+                cache_interpretation(calendar_names, texts[i], items[n])
+            except (TypeError, ValueError) as e:
+                print(f"Invalid batch item for '{texts[i]}': {e}")
+
+    # Anything the batch could not handle goes through the per-line pipeline
+    retry_indexes = [i for i, event in enumerate(results) if event is None]
+    retried, errors = interpret_concurrently(calendar_names, [texts[i] for i in retry_indexes], allow_local=False)
+    for i, event in zip(retry_indexes, retried):
+        results[i] = event
+
+    return [event for event in results if event is not None], errors
+
+
+def interpret_concurrently(calendar_names: list[str], texts: list[str], max_workers: int = INTERPRET_WORKERS,
+                           timeout: float = INTERPRET_TIMEOUT, retries: int = INTERPRET_RETRIES,
+                           allow_local: bool = True) -> tuple[list[Event | None], list[tuple[str, str]]]:
+    """
+    Run interpret_input for each input on a bounded thread pool.
+    Each request gets its own timeout and is retried on failure; an input that still
+    fails is reported instead of aborting the others.
+
+    Returns:
+        events (list[Event | None]): One entry per input, in input order (None if it failed).
+        errors (list[tuple[str, str]]): (input, error message) for each failed input.
+    """
+    def interpret(text):
+        for attempt in range(retries + 1):
+            try:
+                return interpret_input(calendar_names, text, timeout=timeout, allow_local=allow_local)
+            except Exception as e:
+                print(f"Interpreting '{text}' failed (attempt {attempt + 1}): {e}")
+                error = e
+        raise error
+
+    events = [None] * len(texts)
+    errors = []
+    if not texts:
+        return events, errors
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(texts))) as executor:
+        futures = [executor.submit(interpret, text) for text in texts]
+        for i, (text, future) in enumerate(zip(texts, futures)):
+            try:
+                events[i] = future.result()
+            except Exception as e:
+                errors.append((text, str(e)))
+    return events, errors
+
+
+def is_valid_event_data(data) -> bool:
+    """Check that an interpreted item has the keys and formats build_event expects."""
+    if not isinstance(data, dict):
+        return False
+    if not isinstance(data.get('summary'), str) or not data['summary'].strip():
+        return False
+    duration = data.get('duration')
+    if duration is not None and (isinstance(duration, bool) or not isinstance(duration, (int, float))):
+        return False
+    try:
+        if data.get('date') is not None:
+            date.fromisoformat(data['date'])
+        if data.get('start') is not None:
+            datetime.fromisoformat(data['start'])
+    except (TypeError, ValueError):
+        return False
+    return True
+
+
+def build_event(event_data: dict, text: str) -> Event:
+    """Turn an interpreted JSON object into an Event, filling in date, duration, end and type."""
     event = Event.from_dict(event_data)
     if not event.date:
         event.date = parse_date(text)
@@ -87,7 +515,41 @@ Respond with only the JSON object.
     return event
 
 
+def classification_key(event) -> str:
+    """Stable cache key for an event's classification, based on its summary and description."""
+    text = f"{event.summary or ''}\x00{event.description or ''}"
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
 def determine_event_type(events) -> list[str]:
+    """
+    Classify events as 'timed', 'chore' or 'todo'.
+    Classifications are cached on disk, so only events that were never classified are sent to the LLM.
+    """
+    keys = [classification_key(e) for e in events]
+    classifications = [classification_cache.get(key) for key in keys]
+
+    # Send each uncached event once, even if it appears several times
+    uncached = {}
+    for event, key, classification in zip(events, keys, classifications):
+        if classification is None and key not in uncached:
+            uncached[key] = event
+
+    if uncached:
+        fresh = dict(zip(uncached, classify_events(list(uncached.values()))))
+        for key, classification in fresh.items():
+            if classification in EVENT_TYPES:
+                classification_cache.set(key, classification)
+        classification_cache.save()
+        classifications = [
+            classification if classification is not None else fresh.get(key)
+            for key, classification in zip(keys, classifications)
+        ]
+
+    return classifications
+
+
+def classify_events(events) -> list[str]:
     event_details = [e.description or e.summary for e in events]
     events_text = "\n".join(event_details)
 
@@ -105,14 +567,7 @@ Example response:
 timed, chore, todo, timed, todo
 """
 
-    response = client.chat.completions.create(
-        model="gpt-4.1",
-        messages=[{"role": "user", "content": prompt}]
-    )
-    content = response.choices[0].message.content
-    if content is None:
-        raise ValueError("OpenAI API returned None content")
-    content = content.strip()
+    content = complete(prompt)
 
     classifications = [c.strip().lower() for c in content.split(",")]
     return classifications
\ No newline at end of file
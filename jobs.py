@@ -0,0 +1,124 @@
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# Jobs run one at a time, so they see each other's changes in order
+JOB_WORKERS = 1
+
+
+class JobCancelled(Exception):
+    """Raised inside a job by Job.check once the job has been cancelled."""
+
+
+class Job:
+    """
+    Handle passed to a running job.
+    The job calls check() between stages to stop early if cancelled, and post() to send
+    work (chat messages, UI updates) back to the thread that drains the runner.
+    """
+    def __init__(self, runner, name):
+        self.name = name
+        self.future = None
+        self._runner = runner
+        self._cancelled = threading.Event()
+
+    @property
+    def cancelled(self):
+        return self._cancelled.is_set()
+
+    def cancel(self):
+        """Ask the job to stop at its next check()."""
+        self._cancelled.set()
+
+    def check(self):
+        """Raise JobCancelled if the job has been cancelled."""
+        if self._cancelled.is_set():
+            raise JobCancelled(self.name)
+
+    def post(self, fn, *args):
+        """Queue fn(*args) to run on the thread that calls JobRunner.drain."""
+        self._runner._results.put((fn, args))
+
+
+class JobRunner:
+    """
+    Runs slow work (LLM calls, Google Calendar requests) off the UI thread.
+    Jobs hand their results back through a queue that the render loop drains every
+    frame, so all Dear PyGui calls stay on the UI thread.
+    """
+    def __init__(self, max_workers=JOB_WORKERS, name="job"):
+        """
+        Parameters:
+            max_workers (int): Jobs run at once.
+            name (str): Prefix for the worker thread names, so separate runners (lanes) can be told apart.
+        """
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._results = queue.SimpleQueue()
+        self._jobs = set()
+        self._lock = threading.Lock()
+
+    def submit(self, name, fn, *args, on_error=None, on_cancel=None):
+        """
+        Run fn(job, *args) on a worker thread.
+
+        Parameters:
+            name (str): Describes the job in messages.
+            fn (callable): The job body; it receives the Job handle first.
+            on_error (callable): Posted with the exception if fn raises.
+            on_cancel (callable): Posted with no arguments if the job is cancelled.
+        Returns:
+            Job: The handle, which can be cancelled.
+        """
+        job = Job(self, name)
+
+        def run():
+            try:
+                job.check()
+                fn(job, *args)
+            except JobCancelled:
+                if on_cancel:
+                    job.post(on_cancel)
+            except Exception as e:
+                if on_error:
+                    job.post(on_error, e)
+                else:
+                    print(f"Error in {name}: {e}")
+            finally:
+                with self._lock:
+                    self._jobs.discard(job)
+
+        with self._lock:
+            self._jobs.add(job)
+        job.future = self._executor.submit(run)
+        return job
+
+    def cancel_all(self):
+        """Cancel every queued or running job. Returns how many were cancelled."""
+        with self._lock:
+            jobs = list(self._jobs)
+        for job in jobs:
+            job.cancel()
+        return len(jobs)
+
+    def drain(self, limit=None):
+        """
+        Run posted callbacks on the calling thread, up to limit of them (all if None).
+        Returns the number run.
+        """
+        count = 0
+        while limit is None or count < limit:
+            try:
+                fn, args = self._results.get_nowait()
+            except queue.Empty:
+                break
+            try:
+                fn(*args)
+            except Exception as e:
+                print(f"Error applying job result: {e}")
+            count += 1
+        return count
+
+    def shutdown(self):
+        """Cancel outstanding jobs and stop the workers without waiting for them."""
+        self.cancel_all()
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -1,25 +1,57 @@
 # Imports
 from __future__ import print_function
-from googleapiclient.discovery import build
-from calendar_class import Calendar
+from contextlib import contextmanager
 from event import Event
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from zoneinfo import ZoneInfo
-import datetime
 import interpreter
-import interface
 import os.path
+import sys
+import time
 import json
 
+# The Google client stack and Dear PyGui are imported inside main() so that each
+# import shows up as its own phase in the startup profile.
+
+# Run with --profile-startup (or SCHEDULER_PROFILE_STARTUP=1) to print time spent per startup phase
+PROFILE_STARTUP = "--profile-startup" in sys.argv or os.environ.get("SCHEDULER_PROFILE_STARTUP") == "1"
+# Event storage backend: "json" (events.json, cleared on exit) or "sqlite" (events.db)
+STORAGE = os.environ.get("SCHEDULER_STORAGE", "json")
+# Also avoid busy time reported by Google's freebusy API for every calendar
+REMOTE_BUSY = os.environ.get("SCHEDULER_REMOTE_BUSY") == "1"
+startup_phases = []
+startup_begin = time.perf_counter()
+
+
+@contextmanager
+def startup_phase(name):
+    """Time a block of startup work for the startup profile."""
+    phase_start = time.perf_counter()
+    try:
+        yield
+    finally:
+        startup_phases.append((name, time.perf_counter() - phase_start))
+
+
+def report_startup():
+    """Print the startup profile, ending with total time to the first frame."""
+    if not PROFILE_STARTUP:
+        return
+    total = time.perf_counter() - startup_begin
+    print("Startup profile:")
+    for name, seconds in startup_phases:
+        print(f"  {name:<32} {seconds * 1000:8.1f} ms")
+    print(f"  {'total to first frame':<32} {total * 1000:8.1f} ms")
 
 
 # If modifying scopes, delete the token.json file.
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 
 def credentials():
+    from google.auth.transport.requests import Request
+    from google.oauth2.credentials import Credentials
+    from google_auth_oauthlib.flow import InstalledAppFlow
+
         # token.json stores the user's access/refresh tokens
+    creds = None
     if os.path.exists('token.json'):
         creds = Credentials.from_authorized_user_file('token.json', SCOPES)
     # If no valid credentials, log in
@@ -48,26 +80,41 @@ def load_from_json(filename="test_events.json"):
 
     return events
 
-def clear_json(filename="events.json"):
-    """Clear the contents of the JSON file."""
-    with open(filename, 'w') as f:
-        json.dump({}, f)
-
-
 def main():
-    today = datetime.date.today()
-    creds = credentials()
-    service = build('calendar', 'v3', credentials=creds)
-    
+    with startup_phase("import Google API client"):
+        from googleapiclient.discovery import build, build_from_document
+        from googleapiclient.discovery_cache import get_static_doc
+        from calendar_class import Calendar
+    with startup_phase("import interface (Dear PyGui)"):
+        import interface
+    with startup_phase("credentials"):
+        creds = credentials()
+
+    with startup_phase("load discovery document"):
+        # Use the discovery document bundled with the client library, parsed once
+        # for every service, instead of fetching it over the network
+        static_document = get_static_doc('calendar', 'v3')
+        discovery_document = json.loads(static_document) if static_document else None
 
-    calendar = Calendar(service)
+    def service_factory():
+        # Each service gets its own httplib2 connection, so workers build their own
+        if discovery_document is None:
+            return build('calendar', 'v3', credentials=creds)
+        return build_from_document(discovery_document, credentials=creds)
 
-    event_list = []
+    with startup_phase("build service"):
+        service = service_factory()
     
 
+    with startup_phase("Calendar init"):
+        calendar = Calendar(service, service_factory=service_factory, incremental_sync=True, storage=STORAGE,
+                            remote_busy=REMOTE_BUSY)
 
-    interface.run_interface(calendar)
-    calendar.save_events(event_list, filename="events.json")
-    clear_json(filename="events.json")
+    interface.run_interface(calendar, on_first_frame=report_startup)
+    print("Interpretation cache:", interpreter.interpretation_cache.stats())
+    # events.json is scratch space for one session; the SQLite store keeps history
+    if STORAGE == 'json':
+        calendar.store.clear()
+    calendar.close()
 if __name__ == '__main__':
     main()
\ No newline at end of file
@@ -0,0 +1,165 @@
+from collections import OrderedDict
+import dearpygui.dearpygui as dpg
+from event_batch import EventBatch
+
+DEFAULT_EVENT_COLOR = (100, 100, 100, 175)
+EVENT_TEXT_COLOR = (255, 255, 255, 255)
+EVENT_TEXT_SIZE = 16
+# Shortest rectangle drawn, so zero-length events stay visible with their title
+MIN_EVENT_HEIGHT = EVENT_TEXT_SIZE + 2
+# Week layers kept at most; the least recently shown ones are deleted beyond this
+MAX_WEEK_LAYERS = 8
+
+
+class WeekRenderer:
+    """
+    Retained-mode drawing of events on the calendar drawlist.
+
+    Each week gets its own draw layer, and every drawn rectangle/text pair is kept under
+    a key of (event key, day offset). render() diffs the week's segments against what the
+    layer already holds and only creates, moves or deletes the items that changed.
+    Paging between weeks shows one layer and hides the rest, and a resize only
+    repositions the visible week's items (relayout). At most max_layers layers are kept.
+    """
+    def __init__(self, parent, colors, max_layers=MAX_WEEK_LAYERS):
+        """
+        Parameters:
+            parent (str | int): The drawlist to add week layers to.
+            colors (dict[str, tuple]): Calendar name -> RGBA color.
+            max_layers (int): Week layers to keep before deleting the least recently shown.
+        """
+        self.parent = parent
+        self.colors = colors
+        self.max_layers = max_layers
+        self.visible_week = None
+        self._layers = OrderedDict()    # week start -> draw layer id, least recently shown first
+        self._items = {}    # week start -> {(event key, day offset): (rect id, text id, segment)}
+        self._layer_metrics = {}    # week start -> grid metrics its items were last placed with
+
+    def _layer(self, week_start):
+        if week_start not in self._layers:
+            self._layers[week_start] = dpg.add_draw_layer(parent=self.parent, show=False)
+            self._items[week_start] = {}
+        return self._layers[week_start]
+
+    def render(self, week_start, events, metrics, timezone):
+        """
+        Bring a week's layer in line with events and show it.
+
+        Parameters:
+            week_start (date): First day of the week.
+            events (Iterable[Event]): Events to draw; only their segments inside the week are used.
+            metrics (dict): The grid geometry (GRID_METRICS).
+            timezone (ZoneInfo): The calendar's local timezone.
+        Returns:
+            tuple[int, int, int]: Counts of items created, moved and deleted.
+        """
+        layer = self._layer(week_start)
+        drawn = self._items[week_start]
+
+        batch = EventBatch(events, timezone).sort()
+        rows, day_offsets, start_minutes, end_minutes = batch.day_segments(week_start)
+
+        wanted = {}
+        for row, day_offset, start_minute, end_minute in zip(
+                rows.tolist(), day_offsets.tolist(), start_minutes.tolist(), end_minutes.tolist()):
+            event = batch.events[row]
+            color = self.colors.get(event.calendar_name, DEFAULT_EVENT_COLOR)
+            wanted[(event.key(), day_offset)] = (day_offset, start_minute, end_minute,
+                                                            color, event.summary or "")
+
+        created = moved = deleted = 0
+        for key in [key for key in drawn if key not in wanted]:
+            rect_id, text_id, _ = drawn.pop(key)
+            dpg.delete_item(rect_id)
+            dpg.delete_item(text_id)
+            deleted += 1
+
+        # A layer laid out with other metrics (a resize while another week was shown) moves everything
+        relayout = self._layer_metrics.get(week_start) != self._metrics_key(metrics)
+        for key, segment in wanted.items():
+            if key not in drawn:
+                pmin, pmax, text_pos = self._geometry(segment, metrics)
+                color, summary = segment[3], segment[4]
+                rect_id = dpg.draw_rectangle(pmin, pmax, color=color, fill=color, parent=layer)
+                text_id = dpg.draw_text(text_pos, summary, size=EVENT_TEXT_SIZE,
+                                        color=EVENT_TEXT_COLOR, parent=layer)
+                drawn[key] = (rect_id, text_id, segment)
+                created += 1
+            elif relayout or drawn[key][2] != segment:
+                rect_id, text_id, _ = drawn[key]
+                self._place(rect_id, text_id, segment, metrics)
+                drawn[key] = (rect_id, text_id, segment)
+                moved += 1
+        self._layer_metrics[week_start] = self._metrics_key(metrics)
+
+        self.show(week_start)
+        return created, moved, deleted
+
+    def relayout(self, metrics):
+        """
+        Reposition the visible week's items for new grid metrics (after a resize).
+        Items are moved with configure_item from their stored segments; nothing is
+        recreated and no events are re-read. Hidden weeks are moved when next rendered.
+
+        Returns:
+            int: Number of items moved.
+        """
+        week_start = self.visible_week
+        if week_start is None or self._layer_metrics.get(week_start) == self._metrics_key(metrics):
+            return 0
+        for rect_id, text_id, segment in self._items[week_start].values():
+            self._place(rect_id, text_id, segment, metrics)
+        self._layer_metrics[week_start] = self._metrics_key(metrics)
+        return len(self._items[week_start])
+
+    @staticmethod
+    def _metrics_key(metrics):
+        return (metrics["time_col_width"], metrics["day_col_width"],
+                metrics["header_height"], metrics["hour_height"])
+
+    @staticmethod
+    def _geometry(segment, metrics):
+        """Rectangle corners and text position for a (day offset, start minute, end minute, ...) segment."""
+        day_offset, start_minute, end_minute = segment[:3]
+        x1 = metrics["time_col_width"] + day_offset * metrics["day_col_width"]
+        x2 = x1 + metrics["day_col_width"]
+        y1 = metrics["header_height"] + start_minute / 60 * metrics["hour_height"]
+        y2 = max(metrics["header_height"] + end_minute / 60 * metrics["hour_height"], y1 + MIN_EVENT_HEIGHT)
+        return (x1, y1), (x2, y2), (x1 + 5, y1 + 5)
+
+    def _place(self, rect_id, text_id, segment, metrics):
+        pmin, pmax, text_pos = self._geometry(segment, metrics)
+        color, summary = segment[3], segment[4]
+        dpg.configure_item(rect_id, pmin=pmin, pmax=pmax, color=color, fill=color)
+        dpg.configure_item(text_id, pos=text_pos, text=summary)
+
+    def show(self, week_start):
+        """Show one week's layer and hide the one shown before, deleting layers beyond max_layers."""
+        if self.visible_week is not None and self.visible_week != week_start:
+            dpg.configure_item(self._layers[self.visible_week], show=False)
+        dpg.configure_item(self._layer(week_start), show=True)
+        self._layers.move_to_end(week_start)
+        self.visible_week = week_start
+        while len(self._layers) > self.max_layers:
+            self.drop(next(iter(self._layers)))
+
+    def drop(self, week_start):
+        """Delete one week's layer and its items."""
+        layer = self._layers.pop(week_start, None)
+        if layer is None:
+            return
+        dpg.delete_item(layer)
+        del self._items[week_start]
+        self._layer_metrics.pop(week_start, None)
+        if self.visible_week == week_start:
+            self.visible_week = None
+
+    def clear(self):
+        """Delete every week layer and the items in them."""
+        for layer in self._layers.values():
+            dpg.delete_item(layer)
+        self._layers.clear()
+        self._items.clear()
+        self._layer_metrics.clear()
+        self.visible_week = None
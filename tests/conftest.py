@@ -0,0 +1,113 @@
+import os
+import sys
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+# The modules live flat in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+CALENDARS = [{'id': 'work-id', 'summary': 'Work'}, {'id': 'home-id', 'summary': 'Home'}]
+
+
+class FakeRequest:
+    def __init__(self, fn):
+        self.fn = fn
+
+    def execute(self, *args, **kwargs):
+        return self.fn()
+
+
+class FakeEvents:
+    def __init__(self, service):
+        self.service = service
+
+    def list(self, calendarId, syncToken=None, pageToken=None, **kwargs):
+        self.service.list_calls.append(dict(kwargs, calendarId=calendarId, syncToken=syncToken))
+        if syncToken is not None and calendarId in self.service.expired:
+            def gone():
+                raise HttpError(httplib2.Response({'status': 410}), b'Sync token is no longer valid')
+            return FakeRequest(gone)
+        if syncToken is not None:
+            items = self.service.changes.get(calendarId, [])
+        else:
+            items = self.service.items.get(calendarId, [])
+        token = self.service.sync_tokens.get(calendarId, f"sync-{len(self.service.list_calls)}")
+        return FakeRequest(lambda: {'items': list(items), 'nextSyncToken': token})
+
+    def insert(self, calendarId, body):
+        def insert():
+            self.service.inserted.append((calendarId, body))
+            return dict(body, id=f"new-{len(self.service.inserted)}")
+        return FakeRequest(insert)
+
+    def delete(self, calendarId, eventId):
+        return FakeRequest(lambda: self.service.deleted.append((calendarId, eventId)) or {})
+
+
+class FakeBatch:
+    def __init__(self, service, callback):
+        self.service = service
+        self.callback = callback
+        self.requests = []
+
+    def add(self, request, request_id=None):
+        self.requests.append((request_id, request))
+
+    def execute(self):
+        self.service.batches.append(len(self.requests))
+        for request_id, request in self.requests:
+            self.callback(request_id, request.execute(), None)
+
+
+class FakeService:
+    """The parts of the Google Calendar service the Calendar class uses, kept in memory."""
+    def __init__(self):
+        self.items = {}         # calendar ID -> event resources returned by a full list
+        self.changes = {}       # calendar ID -> event resources returned for a sync token
+        self.expired = set()    # calendar IDs whose sync tokens are rejected with 410 Gone
+        self.sync_tokens = {}   # calendar ID -> nextSyncToken to hand out (a new one per call if unset)
+        self.busy = {}          # calendar ID -> freebusy busy ranges
+        self.list_calls = []
+        self.inserted = []
+        self.deleted = []
+        self.batches = []
+
+    def events(self):
+        return FakeEvents(self)
+
+    def calendarList(self):
+        service = FakeRequest(None)
+        service.list = lambda **kwargs: FakeRequest(lambda: {'items': CALENDARS})
+        return service
+
+    def calendars(self):
+        service = FakeRequest(None)
+        service.get = lambda **kwargs: FakeRequest(lambda: {'timeZone': 'America/Toronto'})
+        return service
+
+    def freebusy(self):
+        service = FakeRequest(None)
+        service.query = lambda body: FakeRequest(lambda: {'calendars': {
+            item['id']: {'busy': self.busy.get(item['id'], [])} for item in body['items']
+        }})
+        return service
+
+    def new_batch_http_request(self, callback=None):
+        return FakeBatch(self, callback)
+
+
+@pytest.fixture
+def service():
+    return FakeService()
+
+
+@pytest.fixture
+def calendar(tmp_path, monkeypatch, service):
+    """A Calendar on the fake service, with its metadata, mirror and event files in a temporary directory."""
+    monkeypatch.chdir(tmp_path)
+    from calendar_class import Calendar
+    calendar = Calendar(service)
+    yield calendar
+    calendar.close()
@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+import calendar_class
+from calendar_class import COMMIT_CANCELLED
+from event import Event
+
+
+def new_event(calendar, summary, calendar_name="Work", event_id=None):
+    start = datetime.now(calendar.zone).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+    return Event(summary, start.date(), start, start + timedelta(hours=1), id=event_id,
+                 calendar_name=calendar_name, timezone=calendar.zone)
+
+
+def test_inserts_get_their_ids_and_deletes_go_first(calendar, service):
+    added = [new_event(calendar, "Lunch"), new_event(calendar, "Gym", "Home")]
+    old = new_event(calendar, "Old", event_id="old-id")
+
+    results = calendar.commit_events(to_add=added, to_delete=[old])
+
+    assert [(r['action'], r['event'].summary, r['error']) for r in results] == [
+        ('delete', "Old", None), ('insert', "Lunch", None), ('insert', "Gym", None)]
+    assert service.deleted == [('work-id', 'old-id')]
+    assert [(calendar_id, body['summary']) for calendar_id, body in service.inserted] == [
+        ('work-id', "Lunch"), ('home-id', "Gym")]
+    assert [event.id for event in added] == ["new-1", "new-2"]
+    assert service.batches == [3]
+
+
+def test_delete_without_id_is_reported_and_not_sent(calendar, service):
+    results = calendar.commit_events(to_delete=[new_event(calendar, "Unsaved")])
+    assert results[0]['error'] == "Event has no ID"
+    assert service.deleted == [] and service.batches == []
+
+
+def test_operations_are_sent_in_batches(calendar, service, monkeypatch):
+    monkeypatch.setattr(calendar_class, 'BATCH_SIZE', 2)
+    calendar.commit_events(to_add=[new_event(calendar, f"Event {i}") for i in range(5)])
+    assert service.batches == [2, 2, 1]
+
+
+def test_cancelled_commit_stops_between_batches(calendar, service, monkeypatch):
+    monkeypatch.setattr(calendar_class, 'BATCH_SIZE', 2)
+    added = [new_event(calendar, f"Event {i}") for i in range(5)]
+
+    results = calendar.commit_events(to_add=added, cancelled=lambda: len(service.batches) >= 1)
+
+    assert service.batches == [2]
+    assert [r['error'] for r in results] == [None, None, COMMIT_CANCELLED, COMMIT_CANCELLED, COMMIT_CANCELLED]
+    assert [event.id for event in added[2:]] == [None, None, None]
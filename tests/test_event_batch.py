@@ -0,0 +1,75 @@
+from datetime import date, datetime, time, timedelta
+from event import Event, get_zone
+from event_batch import EventBatch
+
+TZ = get_zone('America/Toronto')
+WEEK = date(2025, 1, 6)
+
+
+def at(day_offset, hour, minute=0):
+    return datetime.combine(WEEK + timedelta(days=day_offset), time(hour, minute), tzinfo=TZ)
+
+
+def segments(events, week_start=WEEK, days=7):
+    rows, day_offsets, start_minutes, end_minutes = EventBatch(events, TZ).day_segments(week_start, days)
+    return list(zip(rows.tolist(), day_offsets.tolist(), start_minutes.tolist(), end_minutes.tolist()))
+
+
+def test_event_within_a_day():
+    assert segments([Event("Lunch", None, at(1, 12), at(1, 13))]) == [(0, 1, 720, 780)]
+
+
+def test_event_over_midnight_is_split():
+    assert segments([Event("Late", None, at(0, 23), at(1, 1))]) == [(0, 0, 1380, 1440), (0, 1, 0, 60)]
+
+
+def test_event_ending_at_midnight_stays_on_its_day():
+    assert segments([Event("Evening", None, at(2, 22), at(3, 0))]) == [(0, 2, 1320, 1440)]
+
+
+def test_zero_length_and_open_ended_events_are_kept():
+    events = [Event("Reminder", None, at(4, 9), at(4, 9)), Event("Start only", None, at(5, 0))]
+    assert segments(events) == [(0, 4, 540, 540), (1, 5, 0, 0)]
+
+
+def test_segments_are_clipped_to_the_week():
+    events = [Event("Trip", None, at(-1, 12), at(1, 12)), Event("Next week", None, at(7, 9), at(7, 10))]
+    assert segments(events) == [(0, 0, 0, 1440), (0, 1, 0, 720)]
+
+
+def test_events_without_a_time_are_skipped():
+    assert segments([Event("Chore", WEEK)]) == []
+
+
+def test_dst_day_keeps_wall_clock_minutes():
+    # Clocks go forward on 2025-03-09 in Toronto
+    dst_week = date(2025, 3, 9)
+    start = datetime(2025, 3, 9, 1, 0, tzinfo=TZ)
+    end = datetime(2025, 3, 9, 4, 0, tzinfo=TZ)
+    assert segments([Event("Night", None, start, end)], dst_week, 1) == [(0, 0, 60, 240)]
+
+
+def test_sort_and_all_day():
+    events = [Event("Holiday", None, at(0, 0), at(1, 0)), Event("Early", None, at(0, 0), at(0, 1))]
+    batch = EventBatch(events, TZ)
+    assert batch.all_day().tolist() == [True, False]
+    assert [event.summary for event in batch.sort().events] == ["Holiday", "Early"]
+    later_first = EventBatch(list(reversed(events)) + [Event("Late", None, at(2, 9), at(2, 10))], TZ)
+    assert [event.summary for event in later_first.sort().events] == ["Early", "Holiday", "Late"]
+
+
+def test_take_keeps_rows_together():
+    events = [Event("A", None, at(0, 9), at(0, 10)), Event("B", WEEK), Event("C", None, at(1, 9), at(1, 11))]
+    batch = EventBatch(events, TZ)
+    timed = batch.take(batch.timed)
+    assert [event.summary for event in timed.events] == ["A", "C"]
+    assert len(timed) == 2
+    assert (timed.local_end - timed.local_start).tolist() == [60, 120]
+
+
+def test_naive_times_are_read_as_local():
+    naive = Event("Holiday", None, datetime.combine(WEEK, time(0, 0)),
+                  datetime.combine(WEEK + timedelta(days=1), time(0, 0)))
+    batch = EventBatch([naive], TZ)
+    assert batch.all_day().tolist() == [True]
+    assert batch.start.tolist() == [int(at(0, 0).timestamp())]
@@ -0,0 +1,64 @@
+from datetime import datetime, timedelta
+from event import Event, get_zone
+from event_set import EventSet
+
+TZ = get_zone('America/Toronto')
+START = datetime(2025, 1, 6, 10, 0, tzinfo=TZ)
+
+
+def make_event(summary, start=START, event_id=None):
+    return Event(summary, None, start, start + timedelta(hours=1), id=event_id)
+
+
+def test_same_id_is_a_duplicate():
+    events = EventSet([make_event("Lunch", event_id="a")])
+    assert not events.add(make_event("Renamed lunch", START + timedelta(hours=2), event_id="a"))
+    assert len(events) == 1
+
+
+def test_same_summary_and_start_is_a_duplicate():
+    events = EventSet([make_event("Lunch")])
+    assert make_event("Lunch") in events
+    assert not events.add(make_event("Lunch"))
+    assert events.add(make_event("Lunch", START + timedelta(days=1)))
+    assert len(events) == 2
+
+
+def test_update_returns_only_new_events_in_order():
+    first, second = make_event("A"), make_event("B")
+    events = EventSet([first])
+    assert events.update([make_event("A"), second]) == [second]
+    assert events.to_list() == [first, second]
+
+
+def test_remove_finds_the_stored_duplicate():
+    stored = make_event("Lunch", event_id="a")
+    events = EventSet([stored])
+    assert events.remove(make_event("Other", event_id="a")) is stored
+    assert len(events) == 0
+    assert events.remove(stored) is None
+
+
+def test_replace_swaps_the_event():
+    old, new = make_event("Old"), make_event("New")
+    events = EventSet([old])
+    assert events.replace(old, new)
+    assert events.to_list() == [new]
+
+
+def test_reindex_after_moving_an_event():
+    chore = make_event("Laundry")
+    events = EventSet([chore])
+    chore.start += timedelta(hours=3)
+    events.reindex(chore)
+
+    assert make_event("Laundry") not in events
+    assert make_event("Laundry", chore.start) in events
+    assert events.remove(chore) is chore
+    assert len(events) == 0
+
+
+def test_reindex_ignores_events_not_stored():
+    events = EventSet([make_event("A")])
+    events.reindex(make_event("B"))
+    assert len(events) == 1
@@ -0,0 +1,131 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from event import Event, get_zone
+from event_store import EventStore, SQLiteEventStore
+
+TZ = get_zone('America/Toronto')
+
+
+@pytest.fixture(params=['json', 'sqlite'])
+def make_store(request, tmp_path):
+    """Build a store of the parametrized kind over one file; call it again to reopen that file."""
+    stores = []
+
+    def make(timezone='America/Toronto'):
+        if request.param == 'json':
+            store = EventStore(str(tmp_path / "events.json"), timezone=timezone, flush_delay=0)
+        else:
+            store = SQLiteEventStore(str(tmp_path / "events.db"), timezone=timezone)
+        stores.append(store)
+        return store
+
+    yield make
+    for store in stores:
+        store.close()
+
+
+def reopen(make_store, store, timezone='America/Toronto'):
+    store.flush()
+    store.close()
+    return make_store(timezone)
+
+
+def interpreted(summary="Lunch"):
+    """An event as the interpreter builds it: naive times, no ID."""
+    return Event.from_dict({'summary': summary, 'date': '2025-01-06', 'start': '2025-01-06T13:00:00',
+                            'end': '2025-01-06T14:00:00', 'duration': 60, 'calendarName': 'Work'})
+
+
+def all_events(store):
+    return store.events_between(datetime(2025, 1, 1, tzinfo=TZ), datetime(2025, 2, 1, tzinfo=TZ))
+
+
+def test_same_interpreted_event_is_stored_once(make_store):
+    store = make_store()
+    store.put(interpreted())
+    store.put(interpreted())
+    assert len(all_events(store)) == 1
+    assert len(all_events(reopen(make_store, store))) == 1
+
+
+def test_same_start_with_another_offset_is_a_duplicate(make_store):
+    store = make_store()
+    store.put(interpreted())
+    utc = Event.from_dict({'summary': 'Lunch', 'date': '2025-01-06', 'start': '2025-01-06T18:00:00+00:00',
+                           'end': '2025-01-06T19:00:00+00:00'})
+    store.put(utc)
+    assert all_events(store) == [utc]
+
+
+def test_same_id_replaces_the_stored_event(make_store):
+    store = make_store()
+    first = interpreted()
+    first.id = "abc"
+    store.put(first)
+    moved = interpreted("Lunch moved")
+    moved.id = "abc"
+    moved.start += timedelta(hours=1)
+    moved.end += timedelta(hours=1)
+    store.put(moved)
+    assert all_events(store) == [moved]
+    assert store.get("abc") is moved
+
+
+def test_reload_in_another_zone_keeps_the_instant(make_store):
+    store = make_store()
+    event = interpreted()
+    store.put(event)
+    reloaded = all_events(reopen(make_store, store, 'Europe/London'))
+    assert len(reloaded) == 1
+    assert reloaded[0].start == event.start
+    assert reloaded[0].start.utcoffset() == timedelta(0)
+
+
+def test_remove_by_id(make_store):
+    store = make_store()
+    event = interpreted()
+    event.id = "abc"
+    store.put(event)
+    store.remove(interpreted())     # a different object without an ID matches nothing
+    assert len(all_events(store)) == 1
+    copy = interpreted()
+    copy.id = "abc"
+    store.remove(copy)
+    assert all_events(store) == []
+
+
+def test_to_dict_only_reuses_text_with_an_offset():
+    naive = interpreted()
+    assert naive.to_dict()['start'] == '2025-01-06T13:00:00-05:00'
+    google = Event.from_dict({'summary': 'Lunch', 'start': '2025-01-06T13:00:00-05:00',
+                              'end': '2025-01-06T14:00:00-05:00'})
+    assert google.to_dict()['start'] == '2025-01-06T13:00:00-05:00'
+    assert json.loads(json.dumps(google.to_dict()))['end'] == '2025-01-06T14:00:00-05:00'
+
+
+def test_put_again_after_insert_files_the_new_id(make_store):
+    store = make_store()
+    event = interpreted()
+    store.put(event)
+    event.id = "new-1"      # as commit_events sets it once Google has inserted the event
+    store.put(event)
+    assert store.get("new-1") is event
+    assert len(all_events(store)) == 1
+    assert reopen(make_store, store).get("new-1").summary == "Lunch"
+
+
+def test_multi_day_event_found_from_inside_without_widening_the_scan(make_store):
+    store = make_store()
+    trip = Event.from_dict({'id': 'trip', 'summary': 'Trip', 'start': '2025-01-02T00:00:00',
+                            'end': '2025-01-12T00:00:00'})
+    store.put(trip)
+    store.put(interpreted())
+    window_start = datetime(2025, 1, 6, 12, tzinfo=TZ)
+    assert [e.summary for e in store.events_between(window_start, window_start + timedelta(hours=2))] \
+        == ["Trip", "Lunch"]
+    store = reopen(make_store, store)
+    assert [e.summary for e in store.events_between(window_start, window_start + timedelta(hours=2))] \
+        == ["Trip", "Lunch"]
+    index = store if isinstance(store, SQLiteEventStore) else store._index
+    assert index._max_duration == 3600
@@ -0,0 +1,82 @@
+from datetime import date, datetime, time, timedelta
+from event import Event, get_zone
+from freebusy import FreeBusyMap
+
+TZ = get_zone('America/Toronto')
+DAY = date(2025, 1, 6)
+
+
+def at(hour, minute=0, day=DAY):
+    return datetime.combine(day, time(hour, minute), tzinfo=TZ)
+
+
+def test_first_fit_skips_busy_time():
+    busy = FreeBusyMap(TZ)
+    busy.mark_busy(at(8), at(9, 30))
+    assert busy.first_fit(DAY, 60) == at(9, 30)
+    assert busy.first_fit(DAY, 60, time(10, 0), time(12, 0)) == at(10)
+
+
+def test_first_fit_needs_a_long_enough_gap():
+    busy = FreeBusyMap(TZ)
+    busy.mark_busy(at(8, 30), at(9))
+    assert busy.first_fit(DAY, 60, time(8, 0), time(10, 0)) == at(9)
+    assert busy.first_fit(DAY, 90, time(8, 0), time(10, 0)) is None
+
+
+def test_mark_free_keeps_overlapping_events_busy():
+    busy = FreeBusyMap(TZ)
+    busy.mark_busy(at(8), at(10))
+    busy.mark_busy(at(9), at(11))
+    busy.mark_free(at(8), at(10))
+    assert busy.first_fit(DAY, 60, time(8, 0), time(12, 0)) == at(8)
+    assert busy.first_fit(DAY, 120, time(8, 0), time(12, 0)) is None
+
+
+def test_loader_builds_days_on_first_use():
+    loaded = []
+
+    def loader(day):
+        loaded.append(day)
+        return [Event("Meeting", None, at(8, day=day), at(12, day=day))]
+
+    busy = FreeBusyMap(TZ, loader=loader)
+    assert busy.first_fit(DAY, 60) == at(12)
+    busy.first_fit(DAY, 30)
+    assert loaded == [DAY]
+    assert busy.loaded_days() == {DAY}
+
+
+def test_all_day_events_do_not_block_time():
+    all_day = Event("Holiday", None, at(0), at(0, day=DAY + timedelta(days=1)))
+    busy = FreeBusyMap(TZ, loader=lambda day: [all_day])
+    assert busy.first_fit(DAY, 60) == at(8)
+
+
+def test_event_past_midnight_blocks_both_days():
+    busy = FreeBusyMap(TZ)
+    busy.mark_busy(at(19), at(9, day=DAY + timedelta(days=1)))
+    assert busy.first_fit(DAY, 60) == at(8)
+    assert busy.first_fit(DAY, 120, time(18, 0), time(0, 0)) is None
+    assert busy.first_fit(DAY + timedelta(days=1), 60) == at(9, day=DAY + timedelta(days=1))
+
+
+def test_partly_covered_slots_are_busy():
+    busy = FreeBusyMap(TZ, slot_minutes=15)
+    busy.mark_busy(at(8, 10), at(8, 20))
+    assert busy.first_fit(DAY, 15, time(8, 0), time(9, 0)) == at(8, 30)
+
+
+def test_mark_free_without_mark_busy_leaves_slots_free():
+    busy = FreeBusyMap(TZ)
+    busy.mark_free(at(8), at(9))
+    busy.mark_busy(at(8), at(9))
+    assert busy.first_fit(DAY, 60, time(8, 0), time(10, 0)) == at(9)
+
+
+def test_naive_all_day_events_do_not_block_time():
+    # Google all-day events are stored with naive datetimes
+    busy = FreeBusyMap(TZ)
+    busy.add_events([Event("Holiday", None, datetime.combine(DAY, time(0, 0)),
+                           datetime.combine(DAY + timedelta(days=1), time(0, 0)))])
+    assert busy.first_fit(DAY, 60) == at(8)
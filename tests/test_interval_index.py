@@ -0,0 +1,59 @@
+from event_store import IntervalIndex, LONG_ITEM_SECONDS
+
+
+def test_overlapping_uses_half_open_intervals():
+    index = IntervalIndex()
+    index.add(10, 20, "a")
+    assert index.overlapping(0, 10) == []
+    assert index.overlapping(20, 30) == []
+    assert index.overlapping(19, 21) == ["a"]
+
+
+def test_long_item_found_from_inside():
+    index = IntervalIndex()
+    index.add(0, 1000, "long")
+    index.add(500, 510, "short")
+    # "long" starts well before the query, within the longest indexed duration
+    assert index.overlapping(700, 710) == ["long"]
+    assert index.overlapping(505, 506) == ["long", "short"]
+
+
+def test_results_are_ordered_by_start():
+    index = IntervalIndex()
+    for start, item in ((30, "c"), (10, "a"), (20, "b")):
+        index.add(start, start + 15, item)
+    assert index.overlapping(0, 100) == ["a", "b", "c"]
+
+
+def test_remove_only_the_given_item():
+    index = IntervalIndex()
+    first, second = object(), object()
+    index.add(10, 20, first)
+    index.add(10, 30, second)
+    index.remove(10, first)
+    assert index.overlapping(0, 100) == [second]
+    assert len(index) == 1
+    index.remove(10, first)
+    assert len(index) == 1
+
+
+def test_long_items_do_not_widen_the_scan():
+    index = IntervalIndex()
+    day = LONG_ITEM_SECONDS
+    index.add(0, 10 * day, "trip")
+    index.add(2 * day, 2 * day + 3600, "meeting")
+    index.add(5 * day, 6 * day, "holiday")
+    # Only short items set how far back a query looks
+    assert index._max_duration == 3600
+    assert index.overlapping(5 * day + 10, 5 * day + 20) == ["trip", "holiday"]
+    assert index.overlapping(2 * day, 6 * day) == ["trip", "meeting", "holiday"]
+    assert index.overlapping(10 * day, 11 * day) == []
+
+
+def test_remove_long_item():
+    index = IntervalIndex()
+    index.add(0, LONG_ITEM_SECONDS, "holiday")
+    index.add(0, 60, "call")
+    index.remove(0, "holiday")
+    assert index.overlapping(0, 100) == ["call"]
+    assert len(index) == 1
@@ -0,0 +1,70 @@
+from datetime import datetime, time, timedelta
+import pytest
+from event import get_zone
+from interpreter import parse_locally, LOCAL_CONFIDENCE_THRESHOLD
+
+TZ = get_zone('America/Toronto')
+CALENDARS = ['Work', 'Home']
+
+
+def tomorrow():
+    return datetime.now(TZ).date() + timedelta(days=1)
+
+
+def parse(text):
+    return parse_locally(CALENDARS, text, TZ)
+
+
+def test_lunch_at_one_tomorrow():
+    event, confidence = parse("Lunch at 1 tomorrow")
+    assert (event.summary, event.start.time(), event.duration) == ("Lunch", time(13, 0), 60)
+    assert event.date == tomorrow()
+    assert confidence >= LOCAL_CONFIDENCE_THRESHOLD
+
+
+def test_groceries_on_a_weekday_with_duration():
+    day = datetime.now(TZ).date() + timedelta(days=2)
+    event, confidence = parse(f"Groceries on {day.strftime('%A')} 45 min")
+    assert (event.summary, event.date, event.start, event.duration) == ("Groceries", day, None, 45)
+    assert event.event_type == 'chore'
+    assert confidence >= LOCAL_CONFIDENCE_THRESHOLD
+
+
+@pytest.mark.parametrize("text, summary, start, duration", [
+    ("Class tomorrow 2-4pm", "Class", time(14, 0), 120),
+    ("Standup 9-9:15 tomorrow", "Standup", time(9, 0), 15),
+    ("Work shift tomorrow 9-5", "Work shift", time(9, 0), 480),
+    ("Meeting 10 to 11am tomorrow", "Meeting", time(10, 0), 60),
+    ("Gym 11–1pm tomorrow", "Gym", time(11, 0), 120),
+    ("Call 3pm-4 tomorrow", "Call", time(15, 0), 60),
+])
+def test_time_ranges_give_start_and_duration(text, summary, start, duration):
+    event, confidence = parse(text)
+    assert (event.summary, event.start.time(), event.duration) == (summary, start, duration)
+    assert event.date == tomorrow()
+    assert event.event_type == 'timed'
+    assert confidence >= LOCAL_CONFIDENCE_THRESHOLD
+
+
+@pytest.mark.parametrize("text", [
+    "March tomorrow 1pm",           # month name and relative day disagree
+    "Party 10pm-12am tomorrow",     # range crossing midnight
+    "Class tomorrow 2-4pm for 30 min",
+])
+def test_contradictory_inputs_go_to_the_llm(text):
+    _, confidence = parse(text)
+    assert confidence < LOCAL_CONFIDENCE_THRESHOLD
+
+
+def test_bare_calendar_name_stays_in_the_summary():
+    event, _ = parse("Work shift tomorrow 9-5")
+    assert event.calendar_name == 'Work'
+    event, _ = parse("Dentist tomorrow at 3pm in my Home calendar")
+    assert (event.summary, event.calendar_name) == ("Dentist", 'Home')
+
+
+def test_relative_dates_use_the_given_zone():
+    zone = get_zone('Pacific/Kiritimati')
+    event, _ = parse_locally(CALENDARS, "Lunch at 1 tomorrow", zone)
+    assert event.date == datetime.now(zone).date() + timedelta(days=1)
+    assert event.start.tzinfo is zone
@@ -0,0 +1,37 @@
+import time as time_module
+from datetime import datetime, time, timedelta
+import pytest
+from calendar_class import Calendar
+
+
+@pytest.fixture
+def busy_calendar(tmp_path, monkeypatch, service):
+    """A Calendar that also avoids freebusy time, on a machine whose local zone is UTC."""
+    monkeypatch.setenv('TZ', 'UTC')
+    time_module.tzset()
+    monkeypatch.chdir(tmp_path)
+    calendar = Calendar(service, remote_busy=True)
+    yield calendar
+    calendar.close()
+    monkeypatch.undo()
+    time_module.tzset()
+
+
+def test_stored_events_are_subtracted_and_all_day_events_ignored(busy_calendar, service):
+    calendar = busy_calendar
+    day = datetime.now(calendar.zone).date() + timedelta(days=3)
+    at = lambda hour: datetime.combine(day, time(hour), tzinfo=calendar.zone)
+    # Google all-day events come back as dates, so they are stored with naive datetimes
+    holiday = calendar._event_from_google({'id': 'holiday', 'summary': 'Holiday', 'start': {'date': day.isoformat()},
+                                           'end': {'date': (day + timedelta(days=1)).isoformat()}}, 'Home')
+    assert holiday.start.tzinfo is None
+    meeting = calendar._event_from_google({'id': 'meeting', 'summary': 'Meeting',
+                                           'start': {'dateTime': at(10).isoformat()},
+                                           'end': {'dateTime': at(11).isoformat()}}, 'Work')
+    calendar.store.put(holiday)
+    calendar.store.put(meeting)
+    service.busy['work-id'] = [{'start': at(9).isoformat(), 'end': at(12).isoformat()}]
+
+    blocks = calendar._unaccounted_busy_between(at(0), at(0) + timedelta(days=1))
+
+    assert [(block.start, block.end) for block in blocks] == [(at(9), at(10)), (at(11), at(12))]
@@ -0,0 +1,59 @@
+from datetime import datetime, time, timedelta
+from event import Event
+
+
+def at(calendar, day, hour, minute=0):
+    return datetime.combine(day, time(hour, minute), tzinfo=calendar.zone)
+
+
+def future_day(calendar):
+    return datetime.now(calendar.zone).date() + timedelta(days=3)
+
+
+def test_chore_overlapping_two_new_events_is_moved_once(calendar):
+    day = future_day(calendar)
+    chore = Event("Laundry", day, at(calendar, day, 9), at(calendar, day, 11), duration=120,
+                  calendar_name="Home", event_type="chore", id="laundry-id", timezone=calendar.zone)
+    calendar.store.put(chore)
+    first = Event("Meeting", day, at(calendar, day, 9), at(calendar, day, 10),
+                  calendar_name="Work", event_type="timed", timezone=calendar.zone)
+    second = Event("Call", day, at(calendar, day, 10), at(calendar, day, 11),
+                   calendar_name="Work", event_type="timed", timezone=calendar.zone)
+
+    delta = calendar.schedule_changes([first, second])
+
+    assert len(delta.moved) == 1
+    original, moved = delta.moved[0]
+    assert original is chore
+    # The original is untouched; the copy avoids both new events
+    assert (chore.start, chore.end) == (at(calendar, day, 9), at(calendar, day, 11))
+    assert moved is not chore
+    assert moved.end <= first.start or moved.start >= second.end
+
+
+def test_non_chore_conflict_stays_and_is_noted(calendar):
+    day = future_day(calendar)
+    dentist = Event("Dentist", day, at(calendar, day, 9), at(calendar, day, 10),
+                    calendar_name="Home", event_type="timed", timezone=calendar.zone)
+    calendar.store.put(dentist)
+    meeting = Event("Meeting", day, at(calendar, day, 9, 30), at(calendar, day, 10, 30),
+                    calendar_name="Work", event_type="timed", timezone=calendar.zone)
+
+    delta = calendar.schedule_changes([meeting])
+
+    assert delta.added == [meeting]
+    assert delta.moved == []
+    assert any("Dentist" in note for note in delta.notes)
+
+
+def test_chore_placed_around_stored_events(calendar):
+    day = future_day(calendar)
+    calendar.store.put(Event("Busy morning", day, at(calendar, day, 8), at(calendar, day, 12),
+                             calendar_name="Work", event_type="timed", timezone=calendar.zone))
+    chore = Event("Groceries", day, duration=45, calendar_name="Home", event_type="chore",
+                  timezone=calendar.zone)
+
+    delta = calendar.schedule_changes([chore])
+
+    assert delta.added == [chore]
+    assert (chore.start, chore.end) == (at(calendar, day, 12), at(calendar, day, 12, 45))
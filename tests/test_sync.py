@@ -0,0 +1,60 @@
+import json
+from datetime import datetime, timedelta
+import pytest
+from calendar_class import SYNC_FILE
+
+
+def resource(event_id, summary, start, hours=1, status='confirmed'):
+    return {'id': event_id, 'status': status, 'summary': summary,
+            'start': {'dateTime': start.isoformat()},
+            'end': {'dateTime': (start + timedelta(hours=hours)).isoformat()}}
+
+
+@pytest.fixture
+def start(calendar):
+    return datetime.now(calendar.zone).replace(minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+
+def mirrored(calendar_id):
+    with open(SYNC_FILE, encoding="utf-8") as f:
+        return json.load(f)[calendar_id]
+
+
+def test_full_sync_then_only_changes(calendar, service, start):
+    service.items['work-id'] = [resource('a', 'Standup', start), resource('b', 'Review', start + timedelta(hours=2))]
+    assert calendar.sync() == 2
+    assert all(call['syncToken'] is None for call in service.list_calls)
+    token = mirrored('work-id')['syncToken']
+
+    service.list_calls.clear()
+    service.changes['work-id'] = [resource('a', 'Standup (moved)', start + timedelta(hours=1)),
+                                  resource('b', 'Review', start, status='cancelled')]
+    assert calendar.sync() == 2
+    assert {call['calendarId']: call['syncToken'] for call in service.list_calls}['work-id'] == token
+    entry = mirrored('work-id')
+    assert list(entry['events']) == ['a']
+    assert entry['events']['a']['summary'] == 'Standup (moved)'
+
+
+def test_expired_token_falls_back_to_a_full_sync(calendar, service, start):
+    service.items['work-id'] = [resource('a', 'Standup', start)]
+    calendar.sync()
+    service.items['work-id'] = [resource('c', 'Planning', start)]
+    service.expired.add('work-id')
+    service.list_calls.clear()
+
+    assert calendar.sync() == 1
+    work_calls = [call['syncToken'] for call in service.list_calls if call['calendarId'] == 'work-id']
+    assert work_calls[0] is not None and work_calls[1] is None
+    assert list(mirrored('work-id')['events']) == ['c']
+
+
+def test_unchanged_sync_does_not_rewrite_the_mirror(calendar, service, start, monkeypatch):
+    service.items['work-id'] = [resource('a', 'Standup', start)]
+    # Google hands back the same token when nothing changed
+    service.sync_tokens = {'work-id': 'work-token', 'home-id': 'home-token'}
+    calendar.sync()
+    writes = []
+    monkeypatch.setattr(calendar, '_save_sync_state', lambda: writes.append(1))
+    assert calendar.sync() == 0
+    assert writes == []
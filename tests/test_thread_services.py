@@ -0,0 +1,37 @@
+import threading
+from datetime import datetime, timedelta
+from calendar_class import Calendar
+from conftest import FakeService
+from event import Event
+
+
+def test_requests_use_the_calling_threads_service(tmp_path, monkeypatch, service):
+    monkeypatch.chdir(tmp_path)
+    built = {}
+
+    def factory():
+        built[threading.get_ident()] = FakeService()
+        return built[threading.get_ident()]
+
+    calendar = Calendar(service, service_factory=factory, remote_busy=True)
+    calendar.name_to_id = {'Work': 'work-id'}    # one calendar takes the single-calendar path
+    start = datetime.now(calendar.zone) + timedelta(days=1)
+
+    def work():
+        calendar.commit_events(to_add=[Event("Lunch", start.date(), start, start + timedelta(hours=1),
+                                             calendar_name="Work", timezone=calendar.zone)])
+        calendar.query_busy(refresh=True)
+        calendar.get_events(start.date())
+
+    threads = [threading.Thread(target=work) for _ in range(2)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    calendar.close()
+
+    # Nothing went through the shared service; each thread sent its own requests
+    assert (service.batches, service.list_calls) == ([], [])
+    for thread in threads:
+        assert built[thread.ident].batches == [1]
+        assert built[thread.ident].list_calls
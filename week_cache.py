@@ -0,0 +1,47 @@
+from collections import OrderedDict
+
+# How many fetched weeks to keep before the least recently shown one is dropped
+WEEK_CACHE_SIZE = 8
+
+
+class WeekCache:
+    """
+    Events fetched from Google Calendar, per week, with least-recently-used eviction.
+    Not thread-safe: use it from the UI thread (fetch jobs post their results there).
+    """
+    def __init__(self, capacity=WEEK_CACHE_SIZE):
+        self.capacity = capacity
+        self._weeks = OrderedDict()     # week start -> events, least recently used first
+
+    def __contains__(self, week_start):
+        return week_start in self._weeks
+
+    def __len__(self):
+        return len(self._weeks)
+
+    def get(self, week_start):
+        """Return a week's events and mark it recently used, or None if it isn't cached."""
+        if week_start not in self._weeks:
+            return None
+        self._weeks.move_to_end(week_start)
+        return self._weeks[week_start]
+
+    def weeks(self):
+        """Return the cached week starts, least recently used first."""
+        return list(self._weeks)
+
+    def peek(self, week_start):
+        """Return a week's events without changing its place in the LRU order."""
+        return self._weeks.get(week_start)
+
+    def put(self, week_start, events):
+        """
+        Store a week's events as the most recently used.
+        Returns the (week start, events) pairs evicted to stay within capacity.
+        """
+        self._weeks[week_start] = events
+        self._weeks.move_to_end(week_start)
+        evicted = []
+        while len(self._weeks) > self.capacity:
+            evicted.append(self._weeks.popitem(last=False))
+        return evicted